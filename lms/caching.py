@@ -0,0 +1,38 @@
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+
+def cache_control_for(policy):
+    return getattr(settings, 'RESPONSE_CACHE_POLICIES', {}).get(policy, 'private, no-cache')
+
+
+def apply_cache_policy(response, policy):
+    """Set the Cache-Control of a RESPONSE_CACHE_POLICIES entry, unless the response already has one."""
+    if not response.has_header('Cache-Control'):
+        response['Cache-Control'] = cache_control_for(policy)
+    return response
+
+
+def cache_policy(policy, vary=()):
+    """
+    Mark a view's responses with a RESPONSE_CACHE_POLICIES entry.
+
+    Goes below @api_view and @permission_classes. A view whose data is only sometimes
+    per-user (e.g. personalized for students) calls apply_cache_policy itself first
+    and passes vary=['Authorization'], so shared caches never hand one user's
+    response to another.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            response = view(request, *args, **kwargs)
+            # Errors keep the default policy, so e.g. a 404 is not cached publicly
+            if response.status_code < 400:
+                apply_cache_policy(response, policy)
+            if vary:
+                patch_vary_headers(response, vary)
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,79 @@
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from lms.caching import apply_cache_policy
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/', 'application/javascript', 'application/xml')
+accepts_br = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress text responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes.
+
+    Uses brotli when the client accepts it and the brotli package is installed,
+    otherwise gzip through Django's GZipMiddleware (BREACH padding included).
+    Strong ETags become weak, as the bytes on the wire differ from the ETag's.
+    no-store responses (logins, token refreshes) carry credentials and are left
+    uncompressed, so their secrets cannot be guessed from compressed lengths.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not self.compressible(response):
+            return response
+        if 'no-store' in response.get('Cache-Control', ''):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or not accepts_br.search(ae):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        quality = getattr(settings, 'RESPONSE_BROTLI_QUALITY', 5)
+        if response.streaming:
+            compressor = brotli.Compressor(quality=quality)
+            response.streaming_content = self.brotli_stream(compressor, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            response.content = brotli.compress(response.content, quality=quality)
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+    @staticmethod
+    def compressible(response):
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return False
+        # Streams (exports) are usually large; their size is not known up front
+        return response.streaming or len(response.content) >= getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+
+    @staticmethod
+    def brotli_stream(compressor, chunks):
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class CachePolicyMiddleware(MiddlewareMixin):
+    """Give GET responses without a Cache-Control the RESPONSE_CACHE_DEFAULT_POLICY."""
+
+    def process_response(self, request, response):
+        if request.method in ('GET', 'HEAD'):
+            apply_cache_policy(response, getattr(settings, 'RESPONSE_CACHE_DEFAULT_POLICY', 'private'))
+        return response
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'teachers',
     'school',
     'quiz',
+    'panel',
     'lms',
     'users',
     'userauth',
@@ -55,6 +57,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'lms.middleware.CompressionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    'lms.middleware.CachePolicyMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -96,6 +101,31 @@ DATABASES = {
 }
 
 
+# Cache shared by every worker process: token snapshots, login payloads, quiz answer
+# keys and rendered quizzes, course trees and their version keys live here, so an
+# invalidation made by one process must be seen by all of them. Redis is the cache to
+# deploy with: set REDIS_URL (needs the redis package).
+# Without it, a file-based cache under CACHE_DIR is shared by the processes of this host,
+# meant for development only: every set() lists the whole directory to decide whether
+# to cull, so MAX_ENTRIES is kept small to bound that scan on the hot paths above.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'lms-cache')),
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -115,19 +145,110 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing profile, chosen per deployment with the PASSWORD_HASHER_PROFILE
+# environment variable. The first hasher hashes new passwords; the others still
+# verify older hashes, which are rehashed with the first one on the next login.
+# "argon2" needs the argon2-cffi package and falls back to "pbkdf2" without it.
+PASSWORD_HASHER_PARAMS = {
+    'pbkdf2': {'iterations': 600000},
+    'argon2': {'time_cost': 2, 'memory_cost': 65536, 'parallelism': 2},
+}
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': [
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'users.hashers.TunedArgon2PasswordHasher',
+    ],
+    'argon2': [
+        'users.hashers.TunedArgon2PasswordHasher',
+        'users.hashers.TunedPBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ],
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE', 'pbkdf2')
+if PASSWORD_HASHER_PROFILE == 'argon2':
+    try:
+        import argon2  # noqa: F401
+    except ImportError:
+        PASSWORD_HASHER_PROFILE = 'pbkdf2'
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# Login password checks run in a pool of LOGIN_HASH_WORKERS processes (None: one per
+# CPU, 0: in the request thread). At most LOGIN_HASH_MAX_PENDING checks wait for the
+# pool; further logins wait up to LOGIN_HASH_QUEUE_TIMEOUT seconds, then get a 503.
+LOGIN_HASH_WORKERS = None
+LOGIN_HASH_MAX_PENDING = 64
+LOGIN_HASH_QUEUE_TIMEOUT = 5.0
+
+# Token -> user snapshots used by CachedTokenAuthentication are kept in the shared
+# cache for AUTH_TOKEN_CACHE_TIMEOUT seconds and dropped there on logout, refresh or
+# user changes. Setting AUTH_TOKEN_LOCAL_TTL above 0 adds a per-process LRU of
+# AUTH_TOKEN_LRU_SIZE entries, at the cost of other processes accepting a revoked
+# token for up to that many seconds.
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+AUTH_TOKEN_LOCAL_TTL = 0
+AUTH_TOKEN_LRU_SIZE = 10000
+
+# API tokens expire AUTH_TOKEN_TTL seconds after they were issued or last renewed;
+# a token in use is renewed once less than half of that is left. A user holds at
+# most AUTH_TOKEN_MAX_PER_USER tokens, the oldest is dropped on the next login.
+# Run `manage.py sweep_auth_tokens` (e.g. hourly from cron) to delete expired ones.
+AUTH_TOKEN_TTL = 7 * 24 * 60 * 60
+AUTH_TOKEN_MAX_PER_USER = 5
+
+# Seconds the serialized login profile of a user stays cached (dropped on profile changes).
+LOGIN_PROFILE_CACHE_TIMEOUT = 60 * 60
+
+# Seconds a subject's course tree stays cached; a committed change to the subject or
+# any chapter, topic or content under it makes the cached tree stale.
+COURSE_TREE_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Seconds a content body (served by digest from v1's content body endpoint) stays
+# in the cache; bodies never change, so this only bounds memory use.
+CONTENT_BODY_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+# Response optimization (lms.middleware): text responses of at least
+# RESPONSE_COMPRESSION_MIN_SIZE bytes are sent brotli-compressed (needs the brotli
+# package) or gzipped, whichever the client accepts. GET responses get an ETag
+# (ConditionalGetMiddleware answers If-None-Match with 304) and the Cache-Control
+# of their view's policy (lms.caching.cache_policy), RESPONSE_CACHE_DEFAULT_POLICY
+# otherwise: "public" for data that is the same for every user, "private" for
+# per-user data, "no-store" for credentials.
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+RESPONSE_BROTLI_QUALITY = 5
+RESPONSE_CACHE_POLICIES = {
+    'public': 'public, max-age=60',
+    'private': 'private, no-cache',
+    'no-store': 'no-store',
+}
+RESPONSE_CACHE_DEFAULT_POLICY = 'private'
+
+# API responses are rendered with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    JSON_RENDERER = 'lms.renderers.ORJSONRenderer'
+except ImportError:
+    JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+
+
 # Custom User Model Configuration
 AUTH_USER_MODEL = 'users.CustomUser'
 
 # Rest framework configurations
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'userauth.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # Internationalization
@@ -162,6 +283,45 @@ CORS_ALLOW_ALL_ORIGINS = True
 CORS_ORIGIN_WHITELIST = ['https://*','http://*']
 
 
+# Quiz submissions
+# When enabled, submit_quiz_attempt only stores the raw answers and returns 202;
+# run `python manage.py process_quiz_submissions` to grade them in batches.
+QUIZ_QUEUED_SUBMISSIONS = False
+
+# Compiled quiz answer keys stay in the shared cache for QUIZ_ANSWER_KEY_CACHE_TIMEOUT
+# seconds; each process also keeps the QUIZ_ANSWER_KEY_LRU_SIZE most recently used ones,
+# checked against the quiz's current version in the shared cache on every use.
+QUIZ_ANSWER_KEY_CACHE_TIMEOUT = 60 * 60
+QUIZ_ANSWER_KEY_LRU_SIZE = 256
+# Seconds the rendered quiz detail payload stays in the shared cache (per quiz version).
+QUIZ_DETAIL_CACHE_TIMEOUT = 60 * 60
+
+
+# Student activity logs (TopicAccessLog, StudentLoginActivity) are buffered in process
+# and written with bulk_create once MAX_SIZE rows or MAX_AGE seconds are reached.
+# Set MAX_SIZE to 1 to write every row immediately. Rows that fail to flush are retried,
+# but at most MAX_BACKLOG are kept; older ones are dropped and logged.
+STUDENT_EVENT_BUFFER = {
+    'MAX_SIZE': 500,
+    'MAX_AGE': 2.0,
+    'MAX_BACKLOG': 10000,
+}
+
+
+# Raw activity rows older than this many days are rolled up into daily summaries
+# and deleted by `python manage.py prune_activity_logs`.
+ACTIVITY_LOG_RETENTION_DAYS = 90
+
+
+# Rows fetched per database round trip by the streaming school exports (school.exports).
+SCHOOL_EXPORT_CHUNK_SIZE = 2000
+
+
+# Processes used to hash the default password of bulk-imported students and teachers
+# (users.utils.hash_passwords); None means one per CPU.
+BULK_IMPORT_HASH_WORKERS = None
+
+
 # SMTP Settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'  # Replace with your SMTP host
@@ -1,3 +1,13 @@
 from django.contrib import admin
+from .models import MetricsSnapshot, MetricBucket
 
-# Register your models here.
+
+class MetricBucketInline(admin.TabularInline):
+    model = MetricBucket
+    extra = 0
+
+
+@admin.register(MetricsSnapshot)
+class MetricsSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('id', 'computed_at')
+    inlines = [MetricBucketInline]
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from panel.utils import prune_metrics_snapshots, take_metrics_snapshot
+
+
+class Command(BaseCommand):
+    help = "Compute the platform-wide panel dashboard metrics and store them as a snapshot (run periodically, e.g. hourly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=48, help="Number of most recent snapshots to keep")
+
+    def handle(self, *args, **options):
+        snapshot = take_metrics_snapshot()
+        pruned = prune_metrics_snapshots(max(options['keep'], 1))
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored metrics snapshot {snapshot.id} with {snapshot.buckets.count()} bucket(s); pruned {pruned} old row(s)."
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('computed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('summary', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MetricBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('series', models.CharField(choices=[('enrollment', 'Monthly enrollment'), ('attendance', 'Monthly attendance rate'), ('active_users', 'Daily active users'), ('schools', 'Schools comparison'), ('grades', 'Grade distribution'), ('courses', 'Course popularity')], max_length=20)),
+                ('position', models.PositiveIntegerField()),
+                ('bucket', models.DateField(blank=True, null=True)),
+                ('label', models.CharField(max_length=255)),
+                ('values', models.JSONField(default=dict)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='panel.metricssnapshot')),
+            ],
+            options={
+                'ordering': ['snapshot', 'series', 'position'],
+                'indexes': [models.Index(fields=['snapshot', 'series', 'position'], name='panel_metri_snapsho_6fc6df_idx')],
+            },
+        ),
+    ]
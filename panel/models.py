@@ -1,3 +1,40 @@
 from django.db import models
 
-# Create your models here.
+
+class MetricsSnapshot(models.Model):
+    """
+    One run of the snapshot_panel_metrics command.
+
+    `summary` holds the headline numbers of panel_dashboard; the time series live
+    in MetricBucket rows so each bucket of each series is a row of its own.
+    """
+    computed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    summary = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"Panel metrics at {self.computed_at:%Y-%m-%d %H:%M}"
+
+
+class MetricBucket(models.Model):
+    SERIES_CHOICES = [
+        ('enrollment', 'Monthly enrollment'),
+        ('attendance', 'Monthly attendance rate'),
+        ('active_users', 'Daily active users'),
+        ('schools', 'Schools comparison'),
+        ('grades', 'Grade distribution'),
+        ('courses', 'Course popularity'),
+    ]
+
+    snapshot = models.ForeignKey(MetricsSnapshot, on_delete=models.CASCADE, related_name='buckets')
+    series = models.CharField(max_length=20, choices=SERIES_CHOICES)
+    position = models.PositiveIntegerField()  # order within the series
+    bucket = models.DateField(blank=True, null=True)  # start of the month / day for time series
+    label = models.CharField(max_length=255)
+    values = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ['snapshot', 'series', 'position']
+        indexes = [models.Index(fields=['snapshot', 'series', 'position'])]
+
+    def __str__(self):
+        return f"{self.get_series_display()} / {self.label}"
@@ -29,9 +29,14 @@ class TopicSerializer(serializers.ModelSerializer):
 
 
 class ContentSerializer(serializers.ModelSerializer):
+    # Written as text, read back as the digest and length of the stored body
+    text_content = serializers.CharField(write_only=True, required=False, allow_blank=True, allow_null=True)
+    text_digest = serializers.CharField(source="body_id", read_only=True)
+
     class Meta:
         model = Content
-        fields = "__all__"
+        exclude = ["body"]
+        read_only_fields = ["text_length"]
 
 class AssignStudentSerializer(serializers.Serializer):
     student_ids = serializers.ListField(
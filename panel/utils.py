@@ -0,0 +1,207 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Subquery, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from panel.models import MetricBucket, MetricsSnapshot
+from quiz.models import QuizAttempt
+from school.models import SchoolProfile
+from school.utils import GRADE_THRESHOLDS, grade_case, scored_attempts
+from students.models import DailyLoginSummary, StudentLoginActivity, StudentProfile, SubjectProgressSummary
+from teachers.models import TeacherProfile
+from v1.models import Subject
+
+
+TREND_MONTHS = 12
+ACTIVE_USER_DAYS = 7
+ACTIVE_WINDOW_DAYS = 30  # "active" students and course growth look at the last 30 days
+TOP_SCHOOLS = 10
+TOP_COURSES = 10
+
+# series -> (response key, key the bucket label is returned under)
+SERIES_KEYS = {
+    'enrollment': ('monthlyEnrollment', 'month'),
+    'attendance': ('attendanceRate', 'month'),
+    'active_users': ('activeUsers', 'date'),
+    'schools': ('schoolsComparison', 'school'),
+    'grades': ('gradeDistribution', 'grade'),
+    'courses': ('coursePopularity', 'course'),
+}
+
+
+def month_starts(today, count):
+    """First days of the `count` months ending with the month of `today`, oldest first."""
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append(today.replace(year=year, month=month, day=1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def active_student_ids(start, end):
+    """Ids of students that logged in on local dates start <= day < end, raw or rolled-up logins alike."""
+    ids = set(
+        StudentLoginActivity.objects.filter(login_time__gte=_day_start(start), login_time__lt=_day_start(end))
+        .values_list('student_id', flat=True).distinct()
+    )
+    ids.update(
+        DailyLoginSummary.objects.filter(date__gte=start, date__lt=end).values_list('student_id', flat=True).distinct()
+    )
+    return ids
+
+
+def _percent(part, whole):
+    return round(part * 100 / whole, 2) if whole else 0
+
+
+def _growth(current, previous):
+    if not previous:
+        return 100.0 if current else 0
+    return round((current - previous) * 100 / previous, 2)
+
+
+def compute_panel_metrics():
+    """
+    Compute every panel_dashboard series.
+
+    Returns (summary, {series: [(bucket_date or None, label, values), ...]}). Each
+    time bucket is one range-bounded GROUP BY or DISTINCT query, so the cost grows
+    with the number of buckets, not with the number of schools.
+    """
+    today = timezone.localdate()
+    total_students = StudentProfile.objects.count()
+    total_teachers = TeacherProfile.objects.count()
+    total_schools = SchoolProfile.objects.count()
+    series = {}
+
+    # Enrollment per admission month; "target" is the trailing three-month average
+    months = month_starts(today, TREND_MONTHS + 3)
+    admissions = dict(
+        StudentProfile.objects.filter(admission_date__gte=months[0])
+        .annotate(month=TruncMonth('admission_date')).values_list('month').annotate(count=Count('id')).order_by()
+    )
+    counts = [admissions.get(month, 0) for month in months]
+    series['enrollment'] = [
+        (month, month.strftime('%b'), {"students": counts[i], "target": round(sum(counts[i - 3:i]) / 3)})
+        for i, month in enumerate(months) if i >= 3
+    ]
+
+    # Share of students active in each month
+    months = months[3:]
+    month_ends = months[1:] + [today + timedelta(days=1)]
+    active_per_month = [len(active_student_ids(start, end)) for start, end in zip(months, month_ends)]
+    series['attendance'] = [
+        (month, month.strftime('%b'), {"rate": _percent(active, total_students)})
+        for month, active in zip(months, active_per_month)
+    ]
+
+    days = [today - timedelta(days=offset) for offset in range(ACTIVE_USER_DAYS - 1, -1, -1)]
+    series['active_users'] = [
+        (day, day.isoformat(), {"students": len(active_student_ids(day, day + timedelta(days=1)))})
+        for day in days
+    ]
+
+    window_start = today - timedelta(days=ACTIVE_WINDOW_DAYS - 1)
+    active_recently = active_student_ids(window_start, today + timedelta(days=1))
+
+    schools = list(
+        SchoolProfile.objects.annotate(
+            student_count=Count('students', distinct=True), teacher_count=Count('teachers', distinct=True)
+        ).order_by('-student_count', 'name').values_list('id', 'name', 'student_count', 'teacher_count')[:TOP_SCHOOLS]
+    )
+    active_by_school = Counter(
+        school_id
+        for student_id, school_id in StudentProfile.objects.filter(school_id__in=[school[0] for school in schools])
+        .values_list('id', 'school_id').iterator()
+        if student_id in active_recently
+    )
+    series['schools'] = [
+        (None, name, {
+            "students": students, "teachers": teachers,
+            "activeStudents": active_by_school[school_id],
+            "utilization": _percent(active_by_school[school_id], students),
+        })
+        for school_id, name, students, teachers in schools
+    ]
+
+    attempts = scored_attempts()
+    overall = attempts.aggregate(score_sum=Sum('percentage'), attempt_count=Count('id'))
+    grade_counts = dict(attempts.annotate(grade=grade_case()).values_list('grade').annotate(count=Count('id')).order_by())
+    series['grades'] = [
+        (None, grade, {"students": grade_counts.get(grade, 0), "percentage": _percent(grade_counts.get(grade, 0), overall['attempt_count'])})
+        for grade, _ in GRADE_THRESHOLDS
+    ]
+
+    # Course popularity: students per subject name, growth in quiz attempts over the last two windows
+    previous_start = window_start - timedelta(days=ACTIVE_WINDOW_DAYS)
+    recent_attempts = QuizAttempt.objects.filter(is_submitted=True, completed_at__gte=_day_start(previous_start))
+    current = dict(
+        recent_attempts.filter(completed_at__gte=_day_start(window_start))
+        .values_list('quiz__topic__chapter__subject__name').annotate(count=Count('id')).order_by()
+    )
+    previous = dict(
+        recent_attempts.filter(completed_at__lt=_day_start(window_start))
+        .values_list('quiz__topic__chapter__subject__name').annotate(count=Count('id')).order_by()
+    )
+    courses = Subject.objects.values_list('name').annotate(students=Count('student', distinct=True)).order_by('-students', 'name')
+    series['courses'] = [
+        (None, name, {"students": students, "growth": _growth(current.get(name, 0), previous.get(name, 0))})
+        for name, students in courses[:TOP_COURSES]
+    ]
+
+    progress = SubjectProgressSummary.objects.aggregate(total=Sum('total_topics'), completed=Sum('completed_topics'))
+    summary = {
+        "totalStudents": total_students,
+        "totalTeachers": total_teachers,
+        "totalSchools": total_schools,
+        "averagePerformance": round(overall['score_sum'] / overall['attempt_count'], 2) if overall['attempt_count'] else 0,
+        "enrollmentGrowth": _growth(counts[-1], counts[-2]),
+        "attendanceRate": series['attendance'][-1][2]["rate"],
+        "activeUsers": len(active_recently),
+        "completionRate": _percent(progress['completed'] or 0, progress['total'] or 0),
+    }
+    return summary, series
+
+
+def take_metrics_snapshot():
+    """Compute the panel metrics and store them as a new snapshot."""
+    summary, series = compute_panel_metrics()
+    with transaction.atomic():
+        snapshot = MetricsSnapshot.objects.create(summary=summary)
+        MetricBucket.objects.bulk_create([
+            MetricBucket(snapshot=snapshot, series=name, position=position, bucket=bucket, label=label, values=values)
+            for name, rows in series.items()
+            for position, (bucket, label, values) in enumerate(rows)
+        ])
+    return snapshot
+
+
+def prune_metrics_snapshots(keep):
+    """Delete all but the `keep` most recent snapshots."""
+    stale = MetricsSnapshot.objects.order_by('-computed_at', '-id').values_list('id', flat=True)[keep:]
+    return MetricsSnapshot.objects.filter(id__in=list(stale)).delete()[0]
+
+
+def latest_snapshot_buckets():
+    """Buckets of the most recent snapshot, each with its snapshot attached, in one query."""
+    latest = MetricsSnapshot.objects.order_by('-computed_at', '-id').values('id')[:1]
+    return list(MetricBucket.objects.filter(snapshot=Subquery(latest)).select_related('snapshot'))
+
+
+def dashboard_payload(snapshot, buckets):
+    """Turn a snapshot and its buckets into the panel_dashboard response."""
+    data = {key: [] for key, _ in SERIES_KEYS.values()}
+    for bucket in buckets:
+        key, label_key = SERIES_KEYS[bucket.series]
+        data[key].append({label_key: bucket.label, **bucket.values})
+    data["summary"] = snapshot.summary
+    data["generatedAt"] = snapshot.computed_at
+    return data
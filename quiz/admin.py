@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Quiz, Question, Option, Answer, QuizAttempt, QuestionResponse
+from .models import Quiz, Question, Option, Answer, QuizAttempt, QuizSubmission, QuestionResponse
 
 
 @admin.register(Quiz)
@@ -36,6 +36,13 @@ class QuizAttemptAdmin(admin.ModelAdmin):
     search_fields = ('student__user__full_name', 'quiz__title')
 
 
+@admin.register(QuizSubmission)
+class QuizSubmissionAdmin(admin.ModelAdmin):
+    list_display = ('attempt', 'status', 'worker', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    search_fields = ('attempt__student__user__full_name', 'attempt__quiz__title')
+
+
 @admin.register(QuestionResponse)
 class QuestionResponseAdmin(admin.ModelAdmin):
     list_display = ('attempt', 'question', 'is_correct')
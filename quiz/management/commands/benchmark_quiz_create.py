@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from quiz.serializers import QuizCreateSerializer
+from students.models import StudentProfile
+from users.models import CustomUser
+from v1.models import Subject, Chapter, Topic
+
+
+class Command(BaseCommand):
+    help = "Measure query count and latency of QuizCreateSerializer for quizzes of different sizes. Nothing is kept in the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help="Number of questions per quiz")
+        parser.add_argument('--options', type=int, default=4, help="Options per question")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'questions':>10} {'queries':>8} {'ms':>10}")
+
+        for size in options['sizes']:
+            payload = {
+                "title": f"Benchmark quiz ({size} questions)",
+                "quiz_type": "topic",
+                "questions": [
+                    {
+                        "text": f"Question {i}",
+                        "marks": 1,
+                        "options": [{"text": f"Option {j}"} for j in range(options['options'])],
+                        "correct_option_indexes": [0],
+                    }
+                    for i in range(size)
+                ],
+            }
+
+            # Everything runs inside a rolled back transaction so the benchmark leaves no rows behind
+            with transaction.atomic():
+                topic = self._make_topic()
+                serializer = QuizCreateSerializer(data=payload, context={'topic': topic, 'teacher': None})
+                serializer.is_valid(raise_exception=True)
+
+                start = time.perf_counter()
+                with CaptureQueriesContext(connection) as queries:
+                    serializer.save()
+                elapsed = (time.perf_counter() - start) * 1000
+
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{size:>10} {len(queries):>8} {elapsed:>10.1f}")
+
+    def _make_topic(self):
+        user = CustomUser.objects.create_user(
+            email='quiz-benchmark@example.com',
+            password=None,
+            full_name='Quiz Benchmark',
+            role='student'
+        )
+        student = StudentProfile.objects.create(user=user, roll_number='0', guardian_name='-', contact_number='-')
+        subject = Subject.objects.create(student=student, name='Benchmark')
+        chapter = Chapter.objects.create(subject=subject, title='Benchmark', number=1)
+        return Topic.objects.create(chapter=chapter, title='Benchmark', number=1)
@@ -0,0 +1,86 @@
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from quiz.models import QuizSubmission
+from quiz.utils import grade_submissions
+
+
+class Command(BaseCommand):
+    help = "Grade queued quiz submissions in batches using a pool of local worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Number of worker threads")
+        parser.add_argument('--batch-size', type=int, default=100, help="Submissions claimed per batch")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument('--stale-after', type=int, default=300, help="Seconds after which a claimed batch is handed out again")
+        parser.add_argument('--max-retries', type=int, default=3, help="Failed grading runs before a submission is marked failed")
+        parser.add_argument('--once', action='store_true', help="Drain the queue and exit instead of polling forever")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.stop = threading.Event()
+
+        threads = [
+            threading.Thread(target=self.run_worker, name=f"quiz-grader-{i}", daemon=True)
+            for i in range(options['workers'])
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+
+    def run_worker(self):
+        worker = f"{os.getpid()}-{threading.current_thread().name}-{uuid.uuid4().hex[:8]}"
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    graded = self.process_batch(worker)
+                except Exception as exc:
+                    # e.g. the database went away while claiming; claimed rows are picked up again once they go stale
+                    self.stderr.write(f"{worker}: batch failed: {exc}")
+                    graded = 0
+                if graded:
+                    self.stdout.write(f"{worker}: processed {graded} submission(s)")
+                elif self.options['once']:
+                    break
+                else:
+                    self.stop.wait(self.options['poll_interval'])
+        finally:
+            connection.close()
+
+    def process_batch(self, worker):
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=self.options['stale_after'])
+
+        # Claim a batch with a single conditional UPDATE so two workers never grade the same rows
+        with transaction.atomic():
+            claimable = QuizSubmission.objects.filter(status='pending') | QuizSubmission.objects.filter(
+                status='processing', claimed_at__lt=stale_before
+            )
+            ids = list(claimable.order_by('id').values_list('id', flat=True)[:self.options['batch_size']])
+            if not ids:
+                return 0
+            QuizSubmission.objects.filter(id__in=ids, status__in=['pending', 'processing']).exclude(
+                status='processing', claimed_at__gte=stale_before
+            ).update(status='processing', worker=worker, claimed_at=now)
+
+        submissions = list(
+            QuizSubmission.objects.filter(status='processing', worker=worker, claimed_at=now).select_related('attempt__student')
+        )
+        if submissions:
+            grade_submissions(submissions, worker, self.options['max_retries'])
+        return len(submissions)
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answers', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('graded', 'Graded'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('worker', models.CharField(blank=True, default='', max_length=64)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('attempt', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='submission', to='quiz.quizattempt')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='quiz_quizsu_status_aa50e3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0002_quizsubmission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizsubmission',
+            name='retries',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -81,6 +81,32 @@ class QuizAttempt(models.Model):
         return f"{self.student.user.full_name} → {self.quiz.title}"
 
 
+class QuizSubmission(models.Model):
+    """Raw answers of an attempt waiting for the grading worker (queued submission mode)."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('graded', 'Graded'),
+        ('failed', 'Failed'),
+    ]
+
+    attempt = models.OneToOneField(QuizAttempt, on_delete=models.CASCADE, related_name='submission')
+    answers = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    worker = models.CharField(max_length=64, blank=True, default='')
+    error = models.TextField(blank=True, null=True)
+    retries = models.PositiveIntegerField(default=0)  # failed grading runs so far
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'id'])]
+
+    def __str__(self):
+        return f"Submission for attempt {self.attempt_id} [{self.status}]"
+
+
 class QuestionResponse(models.Model):
     attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name='responses')
     question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='responses')
@@ -1,5 +1,7 @@
+from django.db import transaction
 from rest_framework import serializers
-from quiz.models import Quiz, Question, Option, Answer, QuestionResponse, QuizAttempt
+from quiz.models import Quiz, Question, Option, Answer, QuizAttempt, QuizSubmission
+from quiz.utils import get_answer_key, grade_answers, save_graded_responses, record_on_school_dashboards
 from users.models import CustomUser
 from v1.models import Topic
 
@@ -18,6 +20,14 @@ class QuestionCreateSerializer(serializers.Serializer):
         help_text="Index(es) of correct options from the options list (starting at 0)"
     )
 
+    def validate(self, data):
+        # Reject bad indexes before anything is written, so a quiz is never half-created
+        option_count = len(data['options'])
+        for idx in data['correct_option_indexes']:
+            if idx >= option_count:
+                raise serializers.ValidationError(f"Invalid correct option index: {idx}")
+        return data
+
 
 class QuizCreateSerializer(serializers.Serializer):
     title = serializers.CharField()
@@ -36,31 +46,39 @@ class QuizCreateSerializer(serializers.Serializer):
         teacher = self.context.get('teacher')
         quiz_type = validated_data['quiz_type']
 
-        quiz = Quiz.objects.create(
-            title=validated_data['title'],
-            description=validated_data.get('description'),
-            quiz_type=quiz_type,
-            topic=topic,
-            teacher=teacher if quiz_type == 'teacher' else None
-        )
-
-        for q_data in validated_data['questions']:
-            question = Question.objects.create(
-                quiz=quiz,
-                text=q_data['text'],
-                marks=q_data.get('marks', 1.0),
-                is_multiple_choice=q_data.get('is_multiple_choice', False)
-            )
+        questions_data = validated_data['questions']
 
-            option_objs = []
-            for option_data in q_data['options']:
-                option = Option.objects.create(question=question, text=option_data['text'])
-                option_objs.append(option)
+        with transaction.atomic():
+            quiz = Quiz.objects.create(
+                title=validated_data['title'],
+                description=validated_data.get('description'),
+                quiz_type=quiz_type,
+                topic=topic,
+                teacher=teacher if quiz_type == 'teacher' else None
+            )
 
-            for idx in q_data['correct_option_indexes']:
-                if idx < 0 or idx >= len(option_objs):
-                    raise serializers.ValidationError(f"Invalid correct option index: {idx}")
-                Answer.objects.create(question=question, option=option_objs[idx])
+            # One INSERT per table regardless of quiz size; bulk_create sets the pks we need below
+            questions = Question.objects.bulk_create([
+                Question(
+                    quiz=quiz,
+                    text=q_data['text'],
+                    marks=q_data.get('marks', 1.0),
+                    is_multiple_choice=q_data.get('is_multiple_choice', False)
+                )
+                for q_data in questions_data
+            ])
+
+            option_objs = [
+                [Option(question=question, text=option_data['text']) for option_data in q_data['options']]
+                for question, q_data in zip(questions, questions_data)
+            ]
+            Option.objects.bulk_create([option for options in option_objs for option in options])
+
+            Answer.objects.bulk_create([
+                Answer(question=question, option=options[idx])
+                for question, options, q_data in zip(questions, option_objs, questions_data)
+                for idx in set(q_data['correct_option_indexes'])
+            ])
 
         return quiz
 
@@ -88,9 +106,10 @@ class QuizAttemptSerializer(serializers.Serializer):
         except Quiz.DoesNotExist:
             raise serializers.ValidationError("Quiz not found.")
 
-        question_ids = self.quiz.questions.values_list('id', flat=True)
+        # The answer key doubles as the list of questions that belong to this quiz
+        self.answer_key = get_answer_key(self.quiz.id)
         for ans in answers:
-            if ans['question_id'] not in question_ids:
+            if ans['question_id'] not in self.answer_key:
                 raise serializers.ValidationError(f"Question {ans['question_id']} does not belong to this quiz.")
         return data
 
@@ -99,35 +118,27 @@ class QuizAttemptSerializer(serializers.Serializer):
         quiz = self.quiz
         answers_data = validated_data['answers']
 
-        if QuizAttempt.objects.filter(student=student, quiz=quiz).exists():
-            raise serializers.ValidationError("You have already attempted this quiz.")
-
-        attempt = QuizAttempt.objects.create(student=student, quiz=quiz, is_submitted=True)
-
-        total_score = 0
-
-        for ans_data in answers_data:
-            question = Question.objects.get(id=ans_data['question_id'])
-            selected_options = Option.objects.filter(id__in=ans_data['selected_option_ids'], question=question)
-
-            response = QuestionResponse.objects.create(
-                attempt=attempt,
-                question=question
-            )
-            response.selected_options.set(selected_options)
+        with transaction.atomic():
+            if QuizAttempt.objects.filter(student=student, quiz=quiz).exists():
+                raise serializers.ValidationError("You have already attempted this quiz.")
 
-            correct_options = question.answers.values_list('option_id', flat=True)
-            selected_option_ids = set(selected_options.values_list('id', flat=True))
+            if self.context.get('queued'):
+                # Only persist the raw answers; the process_quiz_submissions worker grades them
+                attempt = QuizAttempt.objects.create(student=student, quiz=quiz)
+                QuizSubmission.objects.create(attempt=attempt, answers=[
+                    {"question_id": ans['question_id'], "selected_option_ids": ans['selected_option_ids']}
+                    for ans in answers_data
+                ])
+                return attempt
 
-            if set(correct_options) == selected_option_ids:
-                response.is_correct = True
-                total_score += question.marks
+            total_score, graded = grade_answers(self.answer_key, answers_data)
 
-            response.save()
+            attempt = QuizAttempt.objects.create(student=student, quiz=quiz, is_submitted=True, score=total_score)
+            attempt.completed_at = attempt.started_at
+            attempt.save(update_fields=['completed_at'])
 
-        attempt.score = total_score
-        attempt.completed_at = attempt.started_at
-        attempt.save()
+            save_graded_responses([(attempt, graded)])
+            record_on_school_dashboards([(attempt, student.school_id)], {quiz.id: self.answer_key})
 
         return attempt
     
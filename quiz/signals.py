@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from quiz.models import Quiz, Question, Option, Answer
+from quiz.utils import invalidate_quiz
+
+
+# Versions are bumped on commit, so no reader can cache the old content under the new
+# version. Ids are read first: a deleted instance has no pk by the time the hook runs.
+@receiver([post_save, post_delete], sender=Quiz)
+def invalidate_quiz_on_quiz_change(sender, instance, **kwargs):
+    quiz_id = instance.id
+    transaction.on_commit(lambda: invalidate_quiz(quiz_id))
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_quiz_on_question_change(sender, instance, **kwargs):
+    quiz_id = instance.quiz_id
+    transaction.on_commit(lambda: invalidate_quiz(quiz_id))
+
+
+@receiver([post_save, post_delete], sender=Option)
+@receiver([post_save, post_delete], sender=Answer)
+def invalidate_quiz_on_option_change(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(id=instance.question_id).values_list('quiz_id', flat=True).first()
+    if quiz_id is not None:
+        transaction.on_commit(lambda: invalidate_quiz(quiz_id))
@@ -1,3 +1,152 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from quiz.models import QuestionResponse, QuizAttempt, QuizSubmission
+from quiz.serializers import QuizCreateSerializer
+from quiz.utils import CompiledQuestion, grade_answers, grade_submissions
+from school.models import SchoolProfile
+from students.models import StudentProfile
+from users.models import CustomUser
+from v1.models import Chapter, Subject, Topic
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class GradeAnswersTests(SimpleTestCase):
+    answer_key = {
+        1: CompiledQuestion(2.0, frozenset({10, 11, 12}), frozenset({11})),
+        2: CompiledQuestion(3.0, frozenset({20, 21, 22}), frozenset({20, 22})),
+    }
+
+    def test_single_choice(self):
+        score, graded = grade_answers(self.answer_key, [{'question_id': 1, 'selected_option_ids': [11]}])
+        self.assertEqual(score, 2.0)
+        self.assertEqual(graded, [(1, {11}, True)])
+
+    def test_multi_select_needs_exactly_the_correct_options(self):
+        for selected, is_correct in (([20, 22], True), ([20], False), ([20, 21, 22], False)):
+            score, graded = grade_answers(self.answer_key, [{'question_id': 2, 'selected_option_ids': selected}])
+            self.assertEqual(graded[0][2], is_correct, selected)
+            self.assertEqual(score, 3.0 if is_correct else 0)
+
+    def test_unknown_option_ids_are_ignored(self):
+        score, graded = grade_answers(self.answer_key, [{'question_id': 1, 'selected_option_ids': [11, 99]}])
+        self.assertEqual(score, 2.0)
+        self.assertEqual(graded, [(1, {11}, True)])
+
+    def test_question_outside_the_quiz(self):
+        with self.assertRaises(KeyError):
+            grade_answers(self.answer_key, [{'question_id': 3, 'selected_option_ids': [30]}])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class QuizSubmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        school_user = CustomUser.objects.create_user(email='school@example.com', password='p', full_name='School', role='school')
+        school = SchoolProfile.objects.create(
+            user=school_user, name='School', address='a', phone_number='1', registration_number='R1'
+        )
+        self.students = [
+            StudentProfile.objects.create(
+                user=CustomUser.objects.create_user(email=f's{i}@example.com', password='p', full_name=f'S{i}', role='student'),
+                school=school, roll_number=str(i), guardian_name='g', contact_number='1',
+            )
+            for i in range(2)
+        ]
+        subject = Subject.objects.create(student=self.students[0], name='Math')
+        chapter = Chapter.objects.create(subject=subject, title='Ch', number=1)
+        topic = Topic.objects.create(chapter=chapter, title='T', number=1)
+
+        serializer = QuizCreateSerializer(data={
+            'title': 'Q', 'quiz_type': 'topic', 'questions': [
+                {'text': 'single', 'marks': 2, 'options': [{'text': 'a'}, {'text': 'b'}], 'correct_option_indexes': [1]},
+                {'text': 'multi', 'marks': 3, 'is_multiple_choice': True,
+                 'options': [{'text': 'a'}, {'text': 'b'}, {'text': 'c'}], 'correct_option_indexes': [0, 2]},
+            ],
+        }, context={'topic': topic})
+        serializer.is_valid(raise_exception=True)
+        self.quiz = serializer.save()
+        self.single, self.multi = [
+            (question, [option.id for option in question.options.order_by('id')])
+            for question in self.quiz.questions.order_by('id')
+        ]
+        self.client = APIClient()
+
+    def answers(self, single_index, multi_indexes):
+        (single, single_options), (multi, multi_options) = self.single, self.multi
+        return [
+            {'question_id': single.id, 'selected_option_ids': [single_options[single_index]]},
+            {'question_id': multi.id, 'selected_option_ids': [multi_options[i] for i in multi_indexes]},
+        ]
+
+    def submit(self, student, answers):
+        return self.client.post(
+            f'/api/v1/quiz/submit/{student.id}/', {'quiz_id': self.quiz.id, 'answers': answers}, format='json'
+        )
+
+    def test_submit_grades_and_stores_responses(self):
+        response = self.submit(self.students[0], self.answers(1, [0, 2]))
+        self.assertEqual(response.status_code, 201, response.content)
+
+        attempt = QuizAttempt.objects.get(student=self.students[0])
+        self.assertTrue(attempt.is_submitted)
+        self.assertEqual(attempt.score, 5.0)
+        self.assertEqual(
+            sorted(QuestionResponse.objects.filter(attempt=attempt).values_list('is_correct', flat=True)), [True, True]
+        )
+
+        partial = self.submit(self.students[1], self.answers(0, [0]))
+        self.assertEqual(partial.status_code, 201, partial.content)
+        self.assertEqual(QuizAttempt.objects.get(student=self.students[1]).score, 0)
+
+    def test_second_attempt_is_rejected(self):
+        self.submit(self.students[0], self.answers(1, [0, 2]))
+        response = self.submit(self.students[0], self.answers(1, [0, 2]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuestionResponse.objects.count(), 2)
+
+    def test_question_of_another_quiz_is_rejected(self):
+        response = self.submit(self.students[0], [{'question_id': 0, 'selected_option_ids': [1]}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuizAttempt.objects.exists())
+
+    def queue(self, student, answers):
+        with override_settings(QUIZ_QUEUED_SUBMISSIONS=True):
+            self.assertEqual(self.submit(student, answers).status_code, 202)
+        submission = QuizSubmission.objects.get(attempt__student=student)
+        QuizSubmission.objects.filter(id=submission.id).update(status='processing', worker='w')
+        return QuizSubmission.objects.select_related('attempt__student').get(id=submission.id)
+
+    def test_queued_submission_is_graded_once(self):
+        submission = self.queue(self.students[0], self.answers(1, [0, 2]))
+        self.assertEqual(grade_submissions([submission], 'w'), 1)
+        self.assertEqual(QuizAttempt.objects.get(id=submission.attempt_id).score, 5.0)
+
+        # A stale re-claim of the same row must not write a second set of responses
+        QuizSubmission.objects.filter(id=submission.id).update(status='processing', worker='other')
+        again = QuizSubmission.objects.select_related('attempt__student').get(id=submission.id)
+        self.assertEqual(grade_submissions([again], 'w'), 0)
+        self.assertEqual(grade_submissions([again], 'other'), 0)
+        self.assertEqual(QuestionResponse.objects.count(), 2)
+        self.assertEqual(QuizSubmission.objects.get(id=submission.id).status, 'graded')
+
+    def test_failing_submission_is_retried_then_failed(self):
+        failing = self.queue(self.students[0], self.answers(1, [0, 2]))
+        passing = self.queue(self.students[1], self.answers(1, [0, 2]))
+
+        with mock.patch('quiz.utils.grade_submission', side_effect=[RuntimeError('boom'), None]):
+            self.assertEqual(grade_submissions([failing, passing], 'w', max_retries=2), 1)
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.retries), ('pending', 1))
+        self.assertEqual(QuizSubmission.objects.get(id=passing.id).status, 'graded')
+
+        QuizSubmission.objects.filter(id=failing.id).update(status='processing', worker='w')
+        with mock.patch('quiz.utils.grade_submission', side_effect=RuntimeError('boom')):
+            grade_submissions([failing], 'w', max_retries=2)
+        failing.refresh_from_db()
+        self.assertEqual((failing.status, failing.retries, failing.error), ('failed', 2, 'RuntimeError: boom'))
@@ -0,0 +1,232 @@
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from quiz.models import Quiz, Question, QuestionResponse, QuizAttempt, QuizSubmission
+from school.utils import record_graded_attempt
+
+
+# marks: float, option_ids: frozenset of valid option ids, correct_option_ids: frozenset
+CompiledQuestion = namedtuple('CompiledQuestion', ['marks', 'option_ids', 'correct_option_ids'])
+
+QUIZ_VERSION_KEY = 'quiz:{quiz_id}:version'
+ANSWER_KEY_CACHE_KEY = 'quiz:{quiz_id}:answer_key:{version}'
+QUIZ_DETAIL_CACHE_KEY = 'quiz:{quiz_id}:detail:{version}'
+
+_answer_keys = OrderedDict()  # quiz_id -> (version, answer_key), most recently used last
+_answer_keys_lock = threading.Lock()
+
+
+def get_quiz_version(quiz_id):
+    """
+    Return the content version of a quiz, kept in the shared cache (settings.CACHES).
+
+    Versions are random tokens rather than counters, so a version key evicted from the
+    cache can never bring an old cached answer key back to life.
+    """
+    key = QUIZ_VERSION_KEY.format(quiz_id=quiz_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_quiz(quiz_id):
+    """
+    Move a quiz to a new content version and drop everything cached for the old one.
+
+    Call it once the change is committed (see quiz.signals); bumping earlier lets a
+    concurrent reader cache the old content under the new version.
+    """
+    key = QUIZ_VERSION_KEY.format(quiz_id=quiz_id)
+    old_version = cache.get(key)
+    if old_version is not None:
+        cache.delete_many([
+            ANSWER_KEY_CACHE_KEY.format(quiz_id=quiz_id, version=old_version),
+            QUIZ_DETAIL_CACHE_KEY.format(quiz_id=quiz_id, version=old_version),
+        ])
+    cache.set(key, uuid.uuid4().hex, None)
+    with _answer_keys_lock:
+        _answer_keys.pop(quiz_id, None)
+
+
+def load_answer_key(quiz_id):
+    """
+    Compile the grading data of a quiz in a single query.
+
+    Returns {question_id: CompiledQuestion} for every question of the quiz,
+    including questions that have no options yet.
+    """
+    rows = Question.objects.filter(quiz_id=quiz_id).values_list(
+        'id', 'marks', 'options__id', 'options__correct_for__id'
+    )
+
+    compiled = {}
+    for question_id, marks, option_id, answer_id in rows:
+        _, option_ids, correct_option_ids = compiled.setdefault(question_id, (marks, set(), set()))
+        if option_id is not None:
+            option_ids.add(option_id)
+            if answer_id is not None:
+                correct_option_ids.add(option_id)
+
+    return {
+        question_id: CompiledQuestion(marks, frozenset(option_ids), frozenset(correct_option_ids))
+        for question_id, (marks, option_ids, correct_option_ids) in compiled.items()
+    }
+
+
+def get_answer_key(quiz_id):
+    """
+    Return the compiled answer key of a quiz.
+
+    Looks in the process-local LRU first, then in the shared cache, and only
+    compiles from the database when neither holds the current version.
+    """
+    version = get_quiz_version(quiz_id)
+
+    with _answer_keys_lock:
+        entry = _answer_keys.get(quiz_id)
+        if entry is not None and entry[0] == version:
+            _answer_keys.move_to_end(quiz_id)
+            return entry[1]
+
+    cache_key = ANSWER_KEY_CACHE_KEY.format(quiz_id=quiz_id, version=version)
+    answer_key = cache.get(cache_key)
+    if answer_key is None:
+        answer_key = load_answer_key(quiz_id)
+        cache.set(cache_key, answer_key, settings.QUIZ_ANSWER_KEY_CACHE_TIMEOUT)
+
+    with _answer_keys_lock:
+        _answer_keys[quiz_id] = (version, answer_key)
+        _answer_keys.move_to_end(quiz_id)
+        while len(_answer_keys) > settings.QUIZ_ANSWER_KEY_LRU_SIZE:
+            _answer_keys.popitem(last=False)
+    return answer_key
+
+
+def grade_answers(answer_key, answers):
+    """
+    Score submitted answers against an answer key without touching the database.
+
+    Selected ids that are not options of the question are ignored. An answer is
+    correct when the remaining selection equals the set of correct options.
+    Returns (total_score, [(question_id, selected_option_ids, is_correct), ...]).
+    """
+    total_score = 0
+    graded = []
+    for ans in answers:
+        question = answer_key[ans['question_id']]
+        selected = question.option_ids.intersection(ans['selected_option_ids'])
+        is_correct = selected == question.correct_option_ids
+        if is_correct:
+            total_score += question.marks
+        graded.append((ans['question_id'], selected, is_correct))
+    return total_score, graded
+
+
+def save_graded_responses(graded_attempts):
+    """
+    Write the QuestionResponse rows and selected_options through-rows of graded attempts.
+
+    graded_attempts is a list of (attempt, graded) pairs, graded as returned by grade_answers.
+    Uses two bulk inserts however many attempts and answers there are.
+    """
+    flat = [(attempt, answer) for attempt, graded in graded_attempts for answer in graded]
+
+    responses = QuestionResponse.objects.bulk_create([
+        QuestionResponse(attempt=attempt, question_id=question_id, is_correct=is_correct)
+        for attempt, (question_id, _, is_correct) in flat
+    ])
+
+    SelectedOption = QuestionResponse.selected_options.through
+    SelectedOption.objects.bulk_create([
+        SelectedOption(questionresponse_id=response.id, option_id=option_id)
+        for response, (_, (_, selected, _)) in zip(responses, flat)
+        for option_id in selected
+    ])
+
+
+def record_on_school_dashboards(graded_attempts, answer_keys):
+    """
+    Add freshly graded attempts to their schools' dashboard summaries.
+
+    graded_attempts holds (attempt, school_id) pairs and answer_keys maps quiz ids to
+    their answer keys, which already know each quiz's total marks.
+    """
+    quiz_ids = {attempt.quiz_id for attempt, _ in graded_attempts}
+    subject_names = dict(Quiz.objects.filter(id__in=quiz_ids).values_list('id', 'topic__chapter__subject__name'))
+
+    for attempt, school_id in graded_attempts:
+        total_marks = sum(question.marks for question in answer_keys[attempt.quiz_id].values())
+        percentage = attempt.score * 100.0 / total_marks if total_marks else None
+        record_graded_attempt(school_id, subject_names.get(attempt.quiz_id), percentage, attempt.completed_at)
+
+
+def grade_submission(submission):
+    """Grade one submission and write its responses, attempt and dashboard update."""
+    attempt = submission.attempt
+    answer_key = get_answer_key(attempt.quiz_id)
+    attempt.score, graded = grade_answers(answer_key, submission.answers)
+    attempt.is_submitted = True
+    attempt.completed_at = attempt.started_at
+
+    save_graded_responses([(attempt, graded)])
+    attempt.save(update_fields=['score', 'is_submitted', 'completed_at'])
+    record_on_school_dashboards([(attempt, attempt.student.school_id)], {attempt.quiz_id: answer_key})
+
+
+def grade_submissions(submissions, worker, max_retries=3):
+    """
+    Grade a batch of QuizSubmission rows claimed by `worker`, each in its own savepoint.
+
+    Rows the worker no longer owns (its claim went stale and another worker took them)
+    are skipped, and attempts that are already submitted are not graded twice. A
+    submission whose answers no longer match the quiz (e.g. a question was deleted
+    after submitting) fails at once; other errors put it back in the queue until it
+    has failed max_retries times. Either way the rest of the batch is still graded.
+    Returns the number of submissions graded.
+    """
+    now = timezone.now()
+    graded_count = 0
+
+    with transaction.atomic():
+        owned = set(
+            QuizSubmission.objects.select_for_update()
+            .filter(id__in=[submission.id for submission in submissions], status='processing', worker=worker)
+            .values_list('id', flat=True)
+        )
+        submitted = set(
+            QuizAttempt.objects.filter(id__in=[submission.attempt_id for submission in submissions], is_submitted=True)
+            .values_list('id', flat=True)
+        )
+
+        for submission in submissions:
+            if submission.id not in owned:
+                continue
+
+            if submission.attempt_id in submitted:
+                submission.status = 'graded'
+            else:
+                try:
+                    with transaction.atomic():
+                        grade_submission(submission)
+                except KeyError as exc:
+                    submission.status = 'failed'
+                    submission.error = f"Question {exc.args[0]} does not belong to this quiz."
+                except Exception as exc:
+                    submission.retries += 1
+                    submission.status = 'failed' if submission.retries >= max_retries else 'pending'
+                    submission.error = f"{type(exc).__name__}: {exc}"
+                else:
+                    submission.status = 'graded'
+                    graded_count += 1
+
+            submission.processed_at = now
+            submission.save(update_fields=['status', 'error', 'retries', 'processed_at'])
+    return graded_count
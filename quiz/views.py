@@ -1,17 +1,23 @@
 from django.shortcuts import render
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_etags
 
 # Create your views here.
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from quiz.serializers import QuizCreateSerializer,QuizAttemptSerializer,QuizListSerializer,QuizDetailWithQuestionsSerializer
 from v1.models import Topic
 from users.models import CustomUser
 from students.models import StudentProfile
-from .models import Quiz
+from .models import Quiz, QuizAttempt
+from .utils import get_quiz_version, QUIZ_DETAIL_CACHE_KEY
 
 
 
@@ -102,7 +108,7 @@ def create_quiz(request, topic_id, teacher_id=None):
 @swagger_auto_schema(
     method='post',
     request_body=QuizAttemptSerializer,
-    responses={201: "Attempt submitted", 400: "Validation error"},
+    responses={201: "Attempt submitted", 202: "Attempt queued for grading", 400: "Validation error"},
     manual_parameters=[
         openapi.Parameter('student_id', openapi.IN_PATH, type=openapi.TYPE_INTEGER, description="ID of the student")
     ]
@@ -115,9 +121,17 @@ def submit_quiz_attempt(request, student_id):
     except StudentProfile.DoesNotExist:
         return Response({"error": "Student not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = QuizAttemptSerializer(data=request.data, context={'student': student})
+    queued = getattr(settings, 'QUIZ_QUEUED_SUBMISSIONS', False)
+    serializer = QuizAttemptSerializer(data=request.data, context={'student': student, 'queued': queued})
     if serializer.is_valid():
         attempt = serializer.save()
+        if queued:
+            return Response({
+                "message": "Quiz submission queued.",
+                "status": "pending",
+                "quiz_id": attempt.quiz_id,
+                "attempt_id": attempt.id
+            }, status=status.HTTP_202_ACCEPTED)
         return Response({
             "message": "Quiz submitted successfully.",
             "score": attempt.score,
@@ -130,6 +144,47 @@ def submit_quiz_attempt(request, student_id):
 
 
 
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Get the grading status of a quiz attempt",
+    manual_parameters=[
+        openapi.Parameter('attempt_id', openapi.IN_PATH, type=openapi.TYPE_INTEGER, description="ID of the quiz attempt")
+    ],
+    responses={
+        200: openapi.Response(
+            description="Attempt status",
+            examples={
+                "application/json": {"attempt_id": 7, "quiz_id": 4, "status": "graded", "score": 3.0}
+            }
+        ),
+        404: "Attempt not found"
+    }
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_quiz_attempt_status(request, attempt_id):
+    try:
+        attempt = QuizAttempt.objects.select_related('submission').get(id=attempt_id)
+    except QuizAttempt.DoesNotExist:
+        return Response({"error": "Attempt not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    # Attempts graded synchronously have no submission row
+    submission = getattr(attempt, 'submission', None)
+    attempt_status = submission.status if submission else 'graded'
+
+    data = {
+        "attempt_id": attempt.id,
+        "quiz_id": attempt.quiz_id,
+        "status": attempt_status,
+        "score": attempt.score if attempt_status == 'graded' else None,
+    }
+    if attempt_status == 'failed':
+        data["error"] = submission.error
+    return Response(data, status=status.HTTP_200_OK)
+
+
+
+
 
 
 
@@ -217,13 +272,35 @@ def get_teacher_quizzes_by_topic(request, teacher_id, topic_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_quiz_detail_with_questions(request, quiz_id):
-    try:
-        quiz = Quiz.objects.get(id=quiz_id, is_active=True)
-    except Quiz.DoesNotExist:
+    # A deleted or deactivated quiz must not revalidate as fresh, so check it first
+    if not Quiz.objects.filter(id=quiz_id, is_active=True).exists():
         return Response({"error": "Quiz not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = QuizDetailWithQuestionsSerializer(quiz)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # The quiz content version changes whenever the quiz, its questions or options change,
+    # so it identifies the rendered payload
+    version = get_quiz_version(quiz_id)
+    etag = f'"{quiz_id}-{version}"'
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+
+    cache_key = QUIZ_DETAIL_CACHE_KEY.format(quiz_id=quiz_id, version=version)
+    body = cache.get(cache_key)
+    if body is None:
+        try:
+            quiz = Quiz.objects.prefetch_related('questions__options').get(id=quiz_id, is_active=True)
+        except Quiz.DoesNotExist:
+            return Response({"error": "Quiz not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = QuizDetailWithQuestionsSerializer(quiz)
+        body = JSONRenderer().render(serializer.data)
+        cache.set(cache_key, body, settings.QUIZ_DETAIL_CACHE_TIMEOUT)
+
+    response = HttpResponse(body, content_type='application/json', status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
 
 
 
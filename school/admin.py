@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SchoolProfile
+from .models import SchoolProfile, SchoolDashboardSummary
 
 @admin.register(SchoolProfile)
 class SchoolProfileAdmin(admin.ModelAdmin):
@@ -9,3 +9,9 @@ class SchoolProfileAdmin(admin.ModelAdmin):
     )
     search_fields = ('name', 'registration_number', 'user__username')
     list_filter = ('board_affiliation', 'established_year')
+
+
+@admin.register(SchoolDashboardSummary)
+class SchoolDashboardSummaryAdmin(admin.ModelAdmin):
+    list_display = ('school', 'attempt_count', 'score_sum', 'refreshed_at')
+    search_fields = ('school__name',)
@@ -0,0 +1,129 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from quiz.models import QuizAttempt
+from students.models import StudentProfile
+from teachers.models import TeacherProfile
+from v1.models import TeacherSubjectAssignment
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+STUDENT_COLUMNS = [
+    ('id', 'id'),
+    ('full_name', 'user__full_name'),
+    ('email', 'user__email'),
+    ('roll_number', 'roll_number'),
+    ('guardian_name', 'guardian_name'),
+    ('contact_number', 'contact_number'),
+    ('date_of_birth', 'date_of_birth'),
+    ('gender', 'gender'),
+    ('address', 'address'),
+    ('admission_date', 'admission_date'),
+    ('class', 'class_assignment__class_model__class_name'),
+    ('section', 'class_assignment__class_model__section'),
+]
+
+ATTEMPT_COLUMNS = [
+    ('attempt_id', 'id'),
+    ('student_id', 'student_id'),
+    ('student_name', 'student__user__full_name'),
+    ('roll_number', 'student__roll_number'),
+    ('quiz_id', 'quiz_id'),
+    ('quiz_title', 'quiz__title'),
+    ('subject', 'quiz__topic__chapter__subject__name'),
+    ('score', 'score'),
+    ('is_submitted', 'is_submitted'),
+    ('started_at', 'started_at'),
+    ('completed_at', 'completed_at'),
+]
+
+TEACHER_COLUMNS = [
+    'id', 'full_name', 'email', 'phone_number', 'qualification', 'gender', 'date_of_birth',
+    'experience_years', 'subject_specialization', 'address', 'assigned_subjects',
+]
+
+
+def export_chunk_size():
+    return getattr(settings, 'SCHOOL_EXPORT_CHUNK_SIZE', 2000)
+
+
+def student_rows(school_id):
+    students = StudentProfile.objects.filter(school_id=school_id).order_by('id')
+    return students.values_list(*[lookup for _, lookup in STUDENT_COLUMNS]).iterator(chunk_size=export_chunk_size())
+
+
+def teacher_rows(school_id):
+    # iterator() with a chunk size runs the subject prefetch once per chunk
+    teachers = TeacherProfile.objects.filter(school_id=school_id).order_by('id').select_related('user').prefetch_related(
+        Prefetch('subject_assignments', queryset=TeacherSubjectAssignment.objects.select_related('subject'))
+    )
+    for teacher in teachers.iterator(chunk_size=export_chunk_size()):
+        yield (
+            teacher.id, teacher.user.full_name, teacher.user.email, teacher.phone_number, teacher.qualification,
+            teacher.gender, teacher.date_of_birth, teacher.experience_years, teacher.subject_specialization,
+            teacher.address, [assignment.subject.name for assignment in teacher.subject_assignments.all()],
+        )
+
+
+def quiz_attempt_rows(school_id):
+    attempts = QuizAttempt.objects.filter(student__school_id=school_id).order_by('id')
+    return attempts.values_list(*[lookup for _, lookup in ATTEMPT_COLUMNS]).iterator(chunk_size=export_chunk_size())
+
+
+# dataset -> (column names, row iterator factory)
+EXPORTS = {
+    'students': ([name for name, _ in STUDENT_COLUMNS], student_rows),
+    'teachers': (TEACHER_COLUMNS, teacher_rows),
+    'quiz-attempts': ([name for name, _ in ATTEMPT_COLUMNS], quiz_attempt_rows),
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line back, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(['; '.join(value) if isinstance(value, list) else value for value in row])
+
+
+def ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def _batched(lines, size):
+    """Join lines into chunks of `size` lines, so the server writes a few large chunks instead of many tiny ones."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def streaming_export(school_id, dataset, export_format):
+    """Build a StreamingHttpResponse that writes the rows while they are read from the database."""
+    columns, rows = EXPORTS[dataset]
+    lines = csv_lines if export_format == 'csv' else ndjson_lines
+    response = StreamingHttpResponse(
+        _batched(lines(columns, rows(school_id)), 500), content_type=EXPORT_FORMATS[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="school-{school_id}-{dataset}.{export_format}"'
+    return response
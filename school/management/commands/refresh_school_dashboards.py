@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from school.models import SchoolProfile
+from school.utils import refresh_school_dashboard
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed dashboard summaries of schools (run periodically, e.g. nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school', type=int, nargs='+', dest='school_ids', help="Only refresh these school profile ids")
+
+    def handle(self, *args, **options):
+        schools = SchoolProfile.objects.all()
+        if options['school_ids']:
+            schools = schools.filter(id__in=options['school_ids'])
+
+        refreshed = 0
+        for school_id in schools.values_list('id', flat=True):
+            refresh_school_dashboard(school_id)
+            refreshed += 1
+        self.stdout.write(self.style.SUCCESS(f"Refreshed dashboard summaries of {refreshed} school(s)."))
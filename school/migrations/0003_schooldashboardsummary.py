@@ -0,0 +1,27 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolDashboardSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('subject_scores', models.JSONField(default=dict)),
+                ('grade_counts', models.JSONField(default=dict)),
+                ('monthly', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('school', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_summary', to='school.schoolprofile')),
+            ],
+        ),
+    ]
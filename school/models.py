@@ -15,3 +15,26 @@ class SchoolProfile(models.Model):
 
     def __str__(self):
         return self.name
+
+
+
+
+
+
+class SchoolDashboardSummary(models.Model):
+    """
+    Precomputed analytics for get_dashboard_data, one row per school.
+
+    Scores are quiz attempt percentages kept as running [sum, count] pairs so new
+    attempts can be added without recomputing (see school.utils).
+    """
+    school = models.OneToOneField(SchoolProfile, on_delete=models.CASCADE, related_name='dashboard_summary')
+    score_sum = models.FloatField(default=0.0)
+    attempt_count = models.PositiveIntegerField(default=0)
+    subject_scores = models.JSONField(default=dict)  # {"Math": [score_sum, attempts]}
+    grade_counts = models.JSONField(default=dict)    # {"A": 3, "B": 1, ...}
+    monthly = models.JSONField(default=dict)         # {"2025-01": {"score_sum": .., "attempts": .., "active_students": ..}}
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard summary of {self.school.name}"
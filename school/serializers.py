@@ -118,6 +118,14 @@ class CustomUserSerializer(serializers.ModelSerializer):
 class StudentProfileSerializer(serializers.ModelSerializer):
     user = CustomUserSerializer()
 
+    def __init__(self, *args, **kwargs):
+        # Optional `fields` kwarg restricts the output to the given field names
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = StudentProfile
         fields = [
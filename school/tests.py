@@ -1,3 +1,53 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
 from django.test import TestCase
 
-# Create your tests here.
+from school.models import SchoolDashboardSummary, SchoolProfile
+from school.utils import compute_school_dashboard, dashboard_payload, refresh_school_dashboard
+from students.models import DailyLoginSummary, StudentLoginActivity, StudentProfile
+from students.utils import record_login_day
+from users.models import CustomUser
+
+
+IST = ZoneInfo('Asia/Kolkata')
+
+
+class ActiveStudentTests(TestCase):
+    def setUp(self):
+        school_user = CustomUser.objects.create_user(email='school@example.com', password='p', full_name='School', role='school')
+        self.school = SchoolProfile.objects.create(
+            user=school_user, name='School', address='a', phone_number='1', registration_number='R1'
+        )
+        self.students = [
+            StudentProfile.objects.create(
+                user=CustomUser.objects.create_user(email=f's{i}@example.com', password='p', full_name=f'S{i}', role='student'),
+                school=self.school, roll_number=str(i), guardian_name='g', contact_number='1',
+            )
+            for i in range(2)
+        ]
+
+    def test_raw_login_and_rollup_in_one_month_count_once(self):
+        student = self.students[0]
+        StudentLoginActivity.objects.create(student=student, login_time=datetime(2026, 3, 20, 9, tzinfo=IST))
+        DailyLoginSummary.objects.create(
+            student=student, date=date(2026, 3, 2), login_count=1,
+            first_login_at=datetime(2026, 3, 2, 9, tzinfo=IST), last_login_at=datetime(2026, 3, 2, 9, tzinfo=IST),
+        )
+
+        monthly = compute_school_dashboard(self.school.id)['monthly']
+        self.assertEqual(monthly['2026-03']['active_students'], 1)
+
+        summary = refresh_school_dashboard(self.school.id)
+        self.assertEqual(dashboard_payload(summary, len(self.students))['attendance_rate'], 50.0)
+
+    def test_first_login_of_a_month_counts_the_student(self):
+        refresh_school_dashboard(self.school.id)
+        student = self.students[1]
+        for day in (2, 3):
+            record_login_day(student, datetime(2026, 4, day, 9, tzinfo=IST))
+        record_login_day(student, datetime(2026, 5, 1, 9, tzinfo=IST))
+
+        monthly = SchoolDashboardSummary.objects.get(school=self.school).monthly
+        self.assertEqual(monthly['2026-04']['active_students'], 1)
+        self.assertEqual(monthly['2026-05']['active_students'], 1)
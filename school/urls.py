@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import register_school,update_teacher, delete_teacher,update_student, delete_student,add_class_with_subjects,assign_teacher_to_subject, assign_student_to_class, manage_school_profile,get_students_by_school,get_teachers_by_school,get_teacher_details,get_dashboard_data
+from .views import register_school,update_teacher, delete_teacher,update_student, delete_student,add_class_with_subjects,assign_teacher_to_subject, assign_student_to_class, manage_school_profile,get_students_by_school,get_teachers_by_school,get_teacher_details,get_dashboard_data,export_school_data
 
 urlpatterns = [
     path('register/', register_school, name='register-school'),
@@ -15,4 +15,5 @@ urlpatterns = [
     path('<int:school_id>/teachers/', get_teachers_by_school, name='get_teachers_by_school'),
     path('<int:school_id>/teachers/<int:teacher_id>/', get_teacher_details, name='get_teacher_details'),
     path('get-dashboard/<int:school_user_id>/', get_dashboard_data, name='school-dashboard'),
+    path('<int:school_id>/export/<str:dataset>/', export_school_data, name='export-school-data'),
 ]
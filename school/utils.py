@@ -0,0 +1,181 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import NullIf, TruncMonth
+from django.utils import timezone
+
+from quiz.models import Question, QuizAttempt
+from school.models import SchoolDashboardSummary
+from students.models import DailyLoginSummary, StudentLoginActivity
+
+
+GRADE_THRESHOLDS = [('A', 90), ('B', 75), ('C', 60), ('D', 40), ('F', 0)]
+TREND_MONTHS = 6
+
+
+def grade_for(percentage):
+    for grade, minimum in GRADE_THRESHOLDS:
+        if percentage >= minimum:
+            return grade
+    return 'F'
+
+
+def month_key(moment):
+    """'YYYY-MM' of a datetime (in settings.TIME_ZONE) or a date."""
+    if hasattr(moment, 'hour'):
+        moment = timezone.localtime(moment)
+    return moment.strftime('%Y-%m')
+
+
+def scored_attempts(school_id=None):
+    """Submitted attempts (of one school, or all) annotated with their percentage of the quiz's total marks."""
+    quiz_total = Question.objects.filter(quiz=OuterRef('quiz')).values('quiz').annotate(total=Sum('marks')).values('total')
+    attempts = QuizAttempt.objects.filter(is_submitted=True)
+    if school_id is not None:
+        attempts = attempts.filter(student__school_id=school_id)
+    return attempts.annotate(
+        percentage=ExpressionWrapper(
+            F('score') * 100.0 / NullIf(Subquery(quiz_total), Value(0.0)), output_field=FloatField()
+        )
+    ).filter(percentage__isnull=False)
+
+
+def grade_case():
+    """Expression mapping an annotated `percentage` to its letter grade."""
+    return Case(
+        *[When(percentage__gte=minimum, then=Value(grade)) for grade, minimum in GRADE_THRESHOLDS],
+        default=Value('F'),
+    )
+
+
+def compute_school_dashboard(school_id):
+    """Compute every dashboard aggregate of a school with GROUP BY queries."""
+    attempts = scored_attempts(school_id)
+
+    overall = attempts.aggregate(score_sum=Sum('percentage'), attempt_count=Count('id'))
+
+    subject_scores = {
+        name: [score_sum, count]
+        for name, score_sum, count in attempts.exclude(quiz__topic__isnull=True)
+        .values_list('quiz__topic__chapter__subject__name')
+        .annotate(score_sum=Sum('percentage'), count=Count('id')).order_by()
+    }
+
+    grade_counts = dict(
+        attempts.annotate(grade=grade_case()).values_list('grade').annotate(count=Count('id')).order_by()
+    )
+
+    tz = timezone.get_current_timezone()
+    monthly = {}
+    for month, score_sum, count in (
+        attempts.exclude(completed_at__isnull=True).annotate(month=TruncMonth('completed_at', tzinfo=tz))
+        .values_list('month').annotate(score_sum=Sum('percentage'), count=Count('id')).order_by()
+    ):
+        monthly[month_key(month)] = {"score_sum": score_sum, "attempts": count, "active_students": 0}
+
+    # Active students per month, from raw logins and from days already rolled up. The first
+    # source gives datetimes and the second dates, so both are keyed by month_key to merge
+    active = {
+        (month_key(month), student_id)
+        for month, student_id in StudentLoginActivity.objects.filter(student__school_id=school_id)
+        .annotate(month=TruncMonth('login_time', tzinfo=tz)).values_list('month', 'student_id').distinct()
+    }
+    active.update(
+        (month_key(month), student_id)
+        for month, student_id in DailyLoginSummary.objects.filter(student__school_id=school_id)
+        .annotate(month=TruncMonth('date')).values_list('month', 'student_id').distinct()
+    )
+    for key, _ in active:
+        entry = monthly.setdefault(key, {"score_sum": 0.0, "attempts": 0, "active_students": 0})
+        entry["active_students"] += 1
+
+    return {
+        "score_sum": overall['score_sum'] or 0.0,
+        "attempt_count": overall['attempt_count'],
+        "subject_scores": subject_scores,
+        "grade_counts": grade_counts,
+        "monthly": monthly,
+    }
+
+
+def refresh_school_dashboard(school_id):
+    """Recompute a school's summary row from scratch."""
+    summary, _ = SchoolDashboardSummary.objects.update_or_create(
+        school_id=school_id, defaults=compute_school_dashboard(school_id)
+    )
+    return summary
+
+
+def record_graded_attempt(school_id, subject_name, percentage, completed_at):
+    """
+    Add one graded attempt to a school's summary without recomputing it.
+
+    Schools without a summary row yet are left alone; the first dashboard read
+    (or refresh_school_dashboards) builds the row from scratch, including this attempt.
+    """
+    if school_id is None or percentage is None:
+        return
+
+    with transaction.atomic():
+        summary = SchoolDashboardSummary.objects.select_for_update().filter(school_id=school_id).first()
+        if summary is None:
+            return
+
+        summary.score_sum += percentage
+        summary.attempt_count += 1
+        if subject_name is not None:
+            score_sum, count = summary.subject_scores.get(subject_name, [0.0, 0])
+            summary.subject_scores[subject_name] = [score_sum + percentage, count + 1]
+        grade = grade_for(percentage)
+        summary.grade_counts[grade] = summary.grade_counts.get(grade, 0) + 1
+        entry = summary.monthly.setdefault(month_key(completed_at), {"score_sum": 0.0, "attempts": 0, "active_students": 0})
+        entry["score_sum"] += percentage
+        entry["attempts"] += 1
+        summary.save()
+
+
+def record_active_student(school_id, day):
+    """
+    Count a student's first login of a month as active in that month of the school's summary.
+
+    Like record_graded_attempt, schools without a summary row yet are left alone.
+    """
+    if school_id is None:
+        return
+
+    with transaction.atomic():
+        summary = SchoolDashboardSummary.objects.select_for_update().filter(school_id=school_id).first()
+        if summary is None:
+            return
+
+        entry = summary.monthly.setdefault(month_key(day), {"score_sum": 0.0, "attempts": 0, "active_students": 0})
+        entry["active_students"] += 1
+        summary.save(update_fields=['monthly'])
+
+
+def dashboard_payload(summary, total_students):
+    """Turn a summary row into the analytics part of the get_dashboard_data response."""
+    def average(score_sum, count):
+        return round(score_sum / count, 2) if count else 0
+
+    months = sorted(summary.monthly.items())[-TREND_MONTHS:]
+    monthly_trends = [
+        {
+            "month": datetime.strptime(key, '%Y-%m').strftime('%b'),
+            "attendance": round(entry["active_students"] * 100 / total_students, 2) if total_students else 0,
+            "performance": average(entry["score_sum"], entry["attempts"]),
+        }
+        for key, entry in months
+    ]
+
+    return {
+        "average_performance": average(summary.score_sum, summary.attempt_count),
+        "attendance_rate": monthly_trends[-1]["attendance"] if monthly_trends else 0,
+        "performance_by_subject": [
+            {"subject": name, "average": average(score_sum, count)}
+            for name, (score_sum, count) in sorted(summary.subject_scores.items())
+        ],
+        "grade_distribution": {grade: summary.grade_counts.get(grade, 0) for grade, _ in GRADE_THRESHOLDS},
+        "monthly_trends": monthly_trends,
+    }
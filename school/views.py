@@ -2,19 +2,30 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.pagination import CursorPagination
+from django.db.models import Count, Sum, Prefetch
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from school.models import SchoolProfile
+from school.models import SchoolProfile, SchoolDashboardSummary
+from school.utils import dashboard_payload, refresh_school_dashboard
+from school.exports import EXPORTS, EXPORT_FORMATS, streaming_export
 from v1.models import TeacherSubjectAssignment
 from teachers.models import TeacherProfile
-from students.models import StudentProfile, StudentClassAssignment
+from students.models import StudentProfile
 from teachers.serializers import TeacherCreateSerializer
 from students.serializers import StudentCreateSerializer
 from .serializers import SchoolRegistrationSerializer, ClassWithSubjectsSerializer, TeacherSubjectAssignSerializer, AssignStudentToClassSerializer, SchoolProfileSerializer, StudentProfileSerializer
 from users.models import CustomUser
 
 
+class StudentCursorPagination(CursorPagination):
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
 @swagger_auto_schema(
     method='post',
     request_body=SchoolRegistrationSerializer,
@@ -348,7 +359,28 @@ def manage_school_profile(request, school_user_id):
             description="ID of the school",
             type=openapi.TYPE_INTEGER,
             required=True
-        )
+        ),
+        openapi.Parameter(
+            'page_size',
+            openapi.IN_QUERY,
+            description="Enable cursor pagination with this many students per page (max 1000)",
+            type=openapi.TYPE_INTEGER,
+            required=False
+        ),
+        openapi.Parameter(
+            'cursor',
+            openapi.IN_QUERY,
+            description="Cursor taken from the previous page's next/previous link",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
+        openapi.Parameter(
+            'fields',
+            openapi.IN_QUERY,
+            description="Comma separated fields to return for each student, e.g. id,user,roll_number,class",
+            type=openapi.TYPE_STRING,
+            required=False
+        ),
     ],
     responses={
         200: openapi.Response(
@@ -410,8 +442,10 @@ def get_students_by_school(request, school_id):
     except SchoolProfile.DoesNotExist:
         return Response({'error': 'School not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-    # Get all students for this school
-    students = StudentProfile.objects.filter(school=school)
+    # Get all students for this school, with user, school and class in the same query
+    students = StudentProfile.objects.filter(school=school).select_related(
+        'user', 'school', 'class_assignment__class_model'
+    )
 
     # Summary counts (assuming 'status' field exists in StudentProfile)
     total_students = students.count()
@@ -419,30 +453,36 @@ def get_students_by_school(request, school_id):
     # inactive_students = students.filter(status="inactive").count()
     # pending_students = students.filter(status="pending").count()
     # rejected_students = students.filter(status="rejected").count()
-    active_students = students.count()
+    active_students = total_students
     inactive_students = 0
     pending_students = 0
     rejected_students = 0
 
+    # Optional field selection: ?fields=id,user,roll_number,class
+    fields = request.query_params.get('fields')
+    fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else None
+
+    # Optional cursor pagination: ?page_size=100 (then follow "next")
+    paginator = None
+    if request.query_params.get('page_size') or request.query_params.get('cursor'):
+        paginator = StudentCursorPagination()
+        students = paginator.paginate_queryset(students, request)
+
     # Serialize student data
-    serializer = StudentProfileSerializer(students, many=True)
+    serializer = StudentProfileSerializer(students, many=True, fields=fields)
 
     # Enrich student data with class name and GPA
     enriched_data = []
-    for student_data in serializer.data:
-        student_id = student_data['id']
-        try:
-            assignment = StudentClassAssignment.objects.get(student_id=student_id)
-            class_name = assignment.class_model.class_name
-        except StudentClassAssignment.DoesNotExist:
-            class_name = None
-
-        student_data['class'] = class_name
-        student_data['gpa'] = 8.5  # Hardcoded GPA
+    for student, student_data in zip(students, serializer.data):
+        if fields is None or 'class' in fields:
+            assignment = getattr(student, 'class_assignment', None)
+            student_data['class'] = assignment.class_model.class_name if assignment else None
+        if fields is None or 'gpa' in fields:
+            student_data['gpa'] = 8.5  # Hardcoded GPA
 
         enriched_data.append(student_data)
 
-    return Response({
+    data = {
         "status": True,
         "total_students": total_students,
         "active_students": active_students,
@@ -450,7 +490,11 @@ def get_students_by_school(request, school_id):
         "pending_students": pending_students,
         "rejected_students": rejected_students,
         "students": enriched_data
-    }, status=status.HTTP_200_OK)
+    }
+    if paginator is not None:
+        data["next"] = paginator.get_next_link()
+        data["previous"] = paginator.get_previous_link()
+    return Response(data, status=status.HTTP_200_OK)
 
 
 
@@ -505,16 +549,20 @@ def get_teachers_by_school(request, school_id):
 
     teachers = TeacherProfile.objects.filter(school=school)
 
-    teacher_data = []
-    total_experience = 0
-    subject_set = set()
+    # Totals are aggregated in the database instead of summed while looping
+    totals = teachers.aggregate(total_teachers=Count('id'), total_experience=Sum('experience_years'))
+    total_departments = TeacherSubjectAssignment.objects.filter(teacher__school=school).aggregate(
+        total=Count('subject__name', distinct=True)
+    )['total']
 
-    for teacher in teachers:
-        subject_assignments = TeacherSubjectAssignment.objects.filter(teacher=teacher)
-        subjects = [assignment.subject.name for assignment in subject_assignments]
-        subject_set.update(subjects)
+    # Users are joined in and all subject assignments come in one extra query
+    teachers = teachers.select_related('user').prefetch_related(
+        Prefetch('subject_assignments', queryset=TeacherSubjectAssignment.objects.select_related('subject'))
+    )
 
-        total_experience += teacher.experience_years or 0
+    teacher_data = []
+    for teacher in teachers:
+        subjects = [assignment.subject.name for assignment in teacher.subject_assignments.all()]
 
         teacher_data.append({
             "id": teacher.id,
@@ -533,9 +581,9 @@ def get_teachers_by_school(request, school_id):
 
     response_data = {
         "status": True,
-        "total_teachers": teachers.count(),
-        "total_experience": total_experience,
-        "total_departments": len(subject_set),
+        "total_teachers": totals['total_teachers'],
+        "total_experience": totals['total_experience'] or 0,
+        "total_departments": total_departments,
         "experience_avg": 5,  # Hardcoded value
         "teachers": teacher_data,
     }
@@ -740,7 +788,7 @@ def get_teacher_details(request, school_id, teacher_id):
 def get_dashboard_data(request, school_user_id):
     try:
         school_user = CustomUser.objects.get(id=school_user_id, role="school")
-        school = SchoolProfile.objects.get(user=school_user)
+        school = SchoolProfile.objects.select_related('dashboard_summary').get(user=school_user)
     except (CustomUser.DoesNotExist, SchoolProfile.DoesNotExist):
         return Response({"status": False, "message": "School not found"}, status=404)
 
@@ -748,47 +796,17 @@ def get_dashboard_data(request, school_user_id):
     total_students = StudentProfile.objects.filter(school=school).count()
     total_teachers = TeacherProfile.objects.filter(school=school).count()
 
-    # Hardcoded values for now
-    average_performance = 82
-    attendance_rate = 95
-
-    # Example subject performance (could be calculated dynamically later)
-    performance_by_subject = [
-        {"subject": "Math", "average": 85},
-        {"subject": "Science", "average": 75},
-        {"subject": "English", "average": 78},
-        {"subject": "History", "average": 72},
-        {"subject": "Arts", "average": 88},
-    ]
-
-    # Example grade distribution
-    grade_distribution = {
-        "A": 45,
-        "B": 78,
-        "C": 65,
-        "D": 25,
-        "F": 12,
-    }
-
-    # Example monthly trends (attendance & performance over 6 months)
-    monthly_trends = [
-        {"month": "Jan", "attendance": 90, "performance": 85},
-        {"month": "Feb", "attendance": 88, "performance": 87},
-        {"month": "Mar", "attendance": 92, "performance": 90},
-        {"month": "Apr", "attendance": 89, "performance": 88},
-        {"month": "May", "attendance": 93, "performance": 91},
-        {"month": "Jun", "attendance": 94, "performance": 92},
-    ]
+    # Analytics come from the precomputed per-school summary (kept current as attempts are graded)
+    try:
+        summary = school.dashboard_summary
+    except SchoolDashboardSummary.DoesNotExist:
+        summary = refresh_school_dashboard(school.id)
 
     data = {
         "school": school.name,
         "total_students": total_students,
         "total_teachers": total_teachers,
-        "average_performance": average_performance,
-        "attendance_rate": attendance_rate,
-        "performance_by_subject": performance_by_subject,
-        "grade_distribution": grade_distribution,
-        "monthly_trends": monthly_trends,
+        **dashboard_payload(summary, total_students),
     }
 
     return Response({"status": True, "data": data}, status=200)
@@ -797,4 +815,34 @@ def get_dashboard_data(request, school_user_id):
 
 
 
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('school_id', openapi.IN_PATH, description="ID of the school", type=openapi.TYPE_INTEGER),
+        openapi.Parameter(
+            'dataset', openapi.IN_PATH, description="What to export", type=openapi.TYPE_STRING,
+            enum=list(EXPORTS)
+        ),
+        openapi.Parameter(
+            'export_format', openapi.IN_QUERY, description="csv (default) or ndjson", type=openapi.TYPE_STRING,
+            enum=list(EXPORT_FORMATS)
+        ),
+    ],
+    operation_summary="Export school data",
+    operation_description="Streams every student, teacher or quiz attempt of a school as CSV or NDJSON, row by row.",
+    responses={200: "File download", 400: "Unknown dataset or format", 404: "School not found"}
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def export_school_data(request, school_id, dataset):
+    if not SchoolProfile.objects.filter(id=school_id).exists():
+        return Response({"error": "School not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    export_format = request.query_params.get('export_format', 'csv')
+    if dataset not in EXPORTS or export_format not in EXPORT_FORMATS:
+        return Response(
+            {"error": f"Choose a dataset from {', '.join(EXPORTS)} and an export_format from {', '.join(EXPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
+    return streaming_export(school_id, dataset, export_format)
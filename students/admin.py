@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     StudentProfile, StudentClassAssignment, TopicProgress,
-    ContentProgress, StudentLoginActivity, TopicAccessLog
+    ContentProgress, StudentLoginActivity, TopicAccessLog, SubjectProgressSummary,
+    LearningStreak, DailyLoginSummary, DailyTopicAccess
 )
 
 @admin.register(StudentProfile)
@@ -44,3 +45,29 @@ class TopicAccessLogAdmin(admin.ModelAdmin):
     list_display = ('student', 'topic', 'accessed_at')
     search_fields = ('student__user__username', 'topic__title')
     list_filter = ('accessed_at',)
+
+
+@admin.register(SubjectProgressSummary)
+class SubjectProgressSummaryAdmin(admin.ModelAdmin):
+    list_display = ('student', 'subject', 'completed_topics', 'total_topics', 'updated_at')
+    search_fields = ('student__user__username', 'subject__name')
+
+
+@admin.register(LearningStreak)
+class LearningStreakAdmin(admin.ModelAdmin):
+    list_display = ('student', 'current_streak', 'longest_streak', 'last_active_date')
+    search_fields = ('student__user__username',)
+
+
+@admin.register(DailyLoginSummary)
+class DailyLoginSummaryAdmin(admin.ModelAdmin):
+    list_display = ('student', 'date', 'login_count', 'first_login_at', 'last_login_at')
+    search_fields = ('student__user__username',)
+    list_filter = ('date',)
+
+
+@admin.register(DailyTopicAccess)
+class DailyTopicAccessAdmin(admin.ModelAdmin):
+    list_display = ('student', 'topic', 'date', 'access_count', 'last_accessed_at')
+    search_fields = ('student__user__username', 'topic__title')
+    list_filter = ('date',)
@@ -0,0 +1,156 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Prefetch
+
+from students.models import ContentProgress, StudentProfile, TopicProgress
+from v1.models import Chapter, Content, Subject, Topic
+
+
+TREE_VERSION_KEY = 'course:tree:version:{subject_id}'
+TREE_CACHE_KEY = 'course:tree:{subject_id}:{version}'
+
+SUBJECT_FIELDS = ['id', 'name', 'code', 'description']
+CHAPTER_FIELDS = ['id', 'title', 'number', 'description']
+TOPIC_FIELDS = ['id', 'title', 'number', 'description', 'is_completed']
+CONTENT_FIELDS = ['id', 'title', 'video_link', 'text_length', 'order', 'is_active', 'is_completed']
+
+
+def include_text_content(request):
+    """Whether the client asked for content bodies with ?expand=text_content or ?fields=...,text_content."""
+    requested = set()
+    for param in ('expand', 'fields'):
+        requested.update(name.strip() for name in request.query_params.get(param, '').split(','))
+    return 'text_content' in requested
+
+
+def chapter_topics_with_contents(chapter_id, with_text=False):
+    """Topics of a chapter with their active contents prefetched, two queries in all."""
+    contents = Content.objects.filter(is_active=True).order_by('order', 'id')
+    if with_text:
+        contents = contents.select_related('body')
+    return (
+        Topic.objects.filter(chapter_id=chapter_id).order_by('number')
+        .prefetch_related(Prefetch('contents', queryset=contents))
+    )
+
+
+def tree_version(subject_id):
+    key = TREE_VERSION_KEY.format(subject_id=subject_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_tree_version(subject_id):
+    """Make cached trees of a subject stale; they are rebuilt on the next read."""
+    # A fresh timestamp, not an increment, so a version lost from the cache is never reused
+    cache.set(TREE_VERSION_KEY.format(subject_id=subject_id), time.time_ns(), None)
+
+
+def build_subject_tree(subject_id):
+    """
+    Subject -> chapters -> topics -> active contents, as plain dicts, or None for an unknown subject.
+
+    Each level is one flat values() query over the whole subject; the levels are
+    stitched together by their parent ids in Python.
+    """
+    subject = Subject.objects.filter(id=subject_id).values(*SUBJECT_FIELDS).first()
+    if subject is None:
+        return None
+
+    chapters = list(Chapter.objects.filter(subject_id=subject_id).order_by('number').values(*CHAPTER_FIELDS))
+    topics = Topic.objects.filter(chapter__subject_id=subject_id).order_by('number').values('chapter_id', *TOPIC_FIELDS)
+    contents = (
+        Content.objects.filter(topic__chapter__subject_id=subject_id, is_active=True)
+        .order_by('order', 'id').values('topic_id', *CONTENT_FIELDS, text_digest=F('body_id'))
+    )
+
+    topics_by_chapter = {chapter['id']: [] for chapter in chapters}
+    contents_by_topic = {}
+    for topic in topics:
+        topic['contents'] = contents_by_topic[topic['id']] = []
+        topics_by_chapter[topic.pop('chapter_id')].append(topic)
+    for content in contents:
+        contents_by_topic[content.pop('topic_id')].append(content)
+
+    for chapter in chapters:
+        chapter['topics'] = topics_by_chapter[chapter['id']]
+    subject['chapters'] = chapters
+    return subject
+
+
+def get_subject_tree(subject_id):
+    """The subject tree from the cache, built and cached for the current version on a miss."""
+    key = TREE_CACHE_KEY.format(subject_id=subject_id, version=tree_version(subject_id))
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_subject_tree(subject_id)
+        if tree is None:
+            return None
+        cache.set(key, tree, getattr(settings, 'COURSE_TREE_CACHE_TIMEOUT', 24 * 60 * 60))
+    return tree
+
+
+def requesting_student_id(request):
+    """StudentProfile id of the requesting user, or None for anonymous and non-student users."""
+    user = request.user
+    snapshot = getattr(user, 'auth_snapshot', None)
+    if snapshot is not None:
+        return snapshot['student_profile_id']
+    if user.is_authenticated and user.role == 'student':
+        return StudentProfile.objects.filter(user=user).values_list('id', flat=True).first()
+    return None
+
+
+def with_student_progress(topics, student_id):
+    """
+    Copies of topic dicts (each with its "contents") carrying one student's progress.
+
+    is_completed becomes the student's own state instead of the global flag, and topics
+    get the student's completion_percentage. Progress is read with one query per level
+    for all the topic and content ids at once; the input dicts, which may come
+    from the cache, are left untouched.
+    """
+    topic_ids = [topic['id'] for topic in topics]
+    content_ids = [content['id'] for topic in topics for content in topic['contents']]
+    topic_progress = {
+        topic_id: (is_completed, percentage)
+        for topic_id, is_completed, percentage in TopicProgress.objects.filter(student_id=student_id, topic_id__in=topic_ids)
+        .values_list('topic_id', 'is_completed', 'completion_percentage')
+    }
+    content_progress = dict(
+        ContentProgress.objects.filter(student_id=student_id, content_id__in=content_ids)
+        .values_list('content_id', 'is_completed')
+    )
+
+    personalized = []
+    for topic in topics:
+        is_completed, percentage = topic_progress.get(topic['id'], (False, 0.0))
+        personalized.append({
+            **topic,
+            'is_completed': is_completed,
+            'completion_percentage': percentage,
+            'contents': [
+                {**content, 'is_completed': content_progress.get(content['id'], False)}
+                for content in topic['contents']
+            ],
+        })
+    return personalized
+
+
+def subject_tree_for_student(tree, student_id):
+    """The subject tree with a student's progress merged in, two queries for the whole tree."""
+    topics = with_student_progress([topic for chapter in tree['chapters'] for topic in chapter['topics']], student_id)
+    personalized = iter(topics)
+    return {
+        **tree,
+        'chapters': [
+            {**chapter, 'topics': [next(personalized) for _ in chapter['topics']]}
+            for chapter in tree['chapters']
+        ],
+    }
@@ -0,0 +1,129 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from students.models import StudentLoginActivity, TopicAccessLog
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    """
+    Collects append-only log rows in process and writes them with bulk_create.
+
+    A buffer is flushed when it holds max_size rows or when its oldest row is
+    max_age seconds old (checked on every add and by a background thread).
+    Rows must carry their own timestamps, since they reach the database late.
+    Rows that fail to flush are kept for the next attempt, but never more than
+    max_backlog of them: beyond that the oldest are dropped and logged.
+    """
+
+    def __init__(self, model, max_size=500, max_age=2.0, max_backlog=None):
+        self.model = model
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_backlog = max_backlog or max_size * 20
+        self._rows = []
+        self._oldest = None
+        self._lock = threading.Lock()
+
+    def add(self, **fields):
+        if self.max_size <= 1:
+            # Buffering disabled: behave like a plain insert
+            self.model.objects.create(**fields)
+            return
+
+        start_flusher()
+        with self._lock:
+            if not self._rows:
+                self._oldest = time.monotonic()
+            self._rows.append(self.model(**fields))
+            due = len(self._rows) >= self.max_size or time.monotonic() - self._oldest >= self.max_age
+        if due:
+            self.flush()
+
+    def pending(self, **fields):
+        """Rows still waiting in this process' buffer whose attributes match `fields`."""
+        with self._lock:
+            rows = list(self._rows)
+        return [row for row in rows if all(getattr(row, name) == value for name, value in fields.items())]
+
+    def flush_if_due(self):
+        with self._lock:
+            due = bool(self._rows) and time.monotonic() - self._oldest >= self.max_age
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._oldest = None
+        if not rows:
+            return 0
+
+        try:
+            self.model.objects.bulk_create(rows, batch_size=self.max_size)
+        except Exception:
+            logger.exception("Could not flush %d %s row(s); keeping them for the next flush", len(rows), self.model.__name__)
+            with self._lock:
+                self._rows = rows + self._rows
+                overflow = len(self._rows) - self.max_backlog
+                if overflow > 0:
+                    del self._rows[:overflow]
+                self._oldest = time.monotonic()
+            if overflow > 0:
+                logger.error("Dropped %d unflushed %s row(s) over the backlog limit of %d",
+                             overflow, self.model.__name__, self.max_backlog)
+            return 0
+        return len(rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+
+_config = getattr(settings, 'STUDENT_EVENT_BUFFER', {})
+
+login_activity_buffer = EventBuffer(
+    StudentLoginActivity, _config.get('MAX_SIZE', 500), _config.get('MAX_AGE', 2.0), _config.get('MAX_BACKLOG')
+)
+topic_access_buffer = EventBuffer(
+    TopicAccessLog, _config.get('MAX_SIZE', 500), _config.get('MAX_AGE', 2.0), _config.get('MAX_BACKLOG')
+)
+
+BUFFERS = [login_activity_buffer, topic_access_buffer]
+
+
+def flush_all():
+    return sum(buffer.flush() for buffer in BUFFERS)
+
+
+def _flusher():
+    while True:
+        time.sleep(min(buffer.max_age for buffer in BUFFERS))
+        for buffer in BUFFERS:
+            try:
+                buffer.flush_if_due()
+            except Exception:
+                logger.exception("Background flush of %s failed", buffer.model.__name__)
+        # Do not hold a connection open between flushes
+        connection.close()
+
+
+_flusher_thread = None
+_flusher_lock = threading.Lock()
+
+
+def start_flusher():
+    """Start the background flush thread and register the shutdown hook, once per process."""
+    global _flusher_thread
+    if _flusher_thread is not None:
+        return
+    with _flusher_lock:
+        if _flusher_thread is None:
+            atexit.register(flush_all)
+            _flusher_thread = threading.Thread(target=_flusher, name='student-event-flusher', daemon=True)
+            _flusher_thread.start()
@@ -0,0 +1,83 @@
+from django.db import transaction
+
+from students.models import StudentClassAssignment, StudentProfile
+from students.serializers import StudentImportRowSerializer
+from users.models import CustomUser
+from users.utils import DEFAULT_PASSWORD, email_conflicts, hash_passwords, serializer_errors
+from v1.models import ClassModel
+
+
+def validate_student_rows(rows, school):
+    """
+    Validate every row before anything is written.
+
+    Besides the field checks of StudentImportRowSerializer, emails must be unique
+    both in the file and in the database, and class ids must belong to the school;
+    both are checked with one query each. Returns (valid_rows, errors) where
+    errors is a list of {"row": line_number, "errors": {...}}.
+    """
+    checked = []
+    for line, row in rows:
+        serializer = StudentImportRowSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data['email'] = CustomUser.objects.normalize_email(data['email'])
+            checked.append((line, data, {}))
+        else:
+            checked.append((line, None, serializer_errors(serializer)))
+
+    emails = [data['email'] for _, data, _ in checked if data]
+    conflicts = iter(email_conflicts(emails))
+    class_ids = {data['class_id'] for _, data, _ in checked if data and 'class_id' in data}
+    school_classes = set(ClassModel.objects.filter(school=school, id__in=class_ids).values_list('id', flat=True))
+
+    valid, errors = [], []
+    for line, data, row_errors in checked:
+        if data:
+            conflict = next(conflicts)
+            if conflict:
+                row_errors['email'] = [conflict]
+            if 'class_id' in data and data['class_id'] not in school_classes:
+                row_errors['class_id'] = ["No class with this id in the school."]
+
+        if row_errors:
+            errors.append({"row": line, "errors": row_errors})
+        else:
+            valid.append(data)
+    return valid, errors
+
+
+def import_students(school, rows, chunk_size=500, skip_invalid=False, workers=None):
+    """
+    Create users, student profiles and class assignments for parsed CSV rows.
+
+    Nothing is written when a row is invalid, unless skip_invalid is set, in which case
+    only the valid rows are imported. Rows are inserted with bulk_create, one
+    transaction per chunk. Returns (created_count, errors).
+    """
+    valid, errors = validate_student_rows(rows, school)
+    if errors and not skip_invalid:
+        return 0, errors
+
+    password_hashes = hash_passwords([DEFAULT_PASSWORD] * len(valid), workers=workers)
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create([
+                CustomUser(email=data['email'], full_name=data['full_name'], role='student', password=password_hash)
+                for data, password_hash in zip(chunk, password_hashes[start:start + chunk_size])
+            ])
+            profiles = StudentProfile.objects.bulk_create([
+                StudentProfile(
+                    user=user, school=school,
+                    **{key: value for key, value in data.items() if key not in ('email', 'full_name', 'class_id')}
+                )
+                for user, data in zip(users, chunk)
+            ])
+            StudentClassAssignment.objects.bulk_create([
+                StudentClassAssignment(student=profile, class_model_id=data['class_id'])
+                for profile, data in zip(profiles, chunk)
+                if 'class_id' in data
+            ])
+    return len(valid), errors
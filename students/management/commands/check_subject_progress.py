@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from students.utils import find_subject_progress_drift, rebuild_subject_progress
+
+
+class Command(BaseCommand):
+    help = "Report SubjectProgressSummary rows that disagree with Topic and TopicProgress."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, nargs='+', dest='student_ids', help="Only check these student profile ids")
+        parser.add_argument('--fix', action='store_true', help="Rebuild the summaries of the students that drifted")
+
+    def handle(self, *args, **options):
+        drift = find_subject_progress_drift(options['student_ids'])
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Subject progress summaries are consistent."))
+            return
+
+        for student_id, subject_id, stored, expected in drift:
+            self.stdout.write(
+                f"student={student_id} subject={subject_id} stored={stored} expected={expected} (total, completed)"
+            )
+
+        if options['fix']:
+            student_ids = sorted({student_id for student_id, _, _, _ in drift})
+            rebuild_subject_progress(student_ids)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt summaries for {len(student_ids)} student(s)."))
+        else:
+            raise CommandError(f"{len(drift)} subject progress summaries are out of date.")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from school.models import SchoolProfile
+from students.imports import import_students
+from users.utils import read_csv_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-create the students of a school from a CSV file (same columns as the bulk-import endpoint)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('school_id', type=int, help="School profile id")
+        parser.add_argument('csv_path')
+        parser.add_argument('--chunk-size', type=int, default=500, help="Rows inserted per transaction")
+        parser.add_argument('--workers', type=int, help="Password hashing processes (default: one per CPU)")
+        parser.add_argument('--skip-invalid', action='store_true', help="Import the valid rows even when some rows have errors")
+
+    def handle(self, *args, **options):
+        try:
+            school = SchoolProfile.objects.get(id=options['school_id'])
+        except SchoolProfile.DoesNotExist:
+            raise CommandError(f"School {options['school_id']} does not exist.")
+
+        with open(options['csv_path'], 'rb') as csv_file:
+            rows = read_csv_rows(csv_file)
+
+        created, errors = import_students(
+            school, rows, chunk_size=options['chunk_size'], skip_invalid=options['skip_invalid'], workers=options['workers']
+        )
+        for error in errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if errors and not options['skip_invalid']:
+            raise CommandError(f"{len(errors)} invalid row(s); nothing was imported.")
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} student(s) into {school.name}."))
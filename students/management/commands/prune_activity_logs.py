@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from students.utils import compact_login_activity, compact_topic_access_logs, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact StudentLoginActivity and TopicAccessLog rows older than the retention window "
+        "into daily summaries, then delete them. Works in small chunks, one short transaction each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'ACTIVITY_LOG_RETENTION_DAYS', 90),
+            help="Keep raw rows of the last N local days"
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--sleep', type=float, default=0.05, help="Pause between chunks so other writers get the lock")
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['days'])
+        self.stdout.write(f"Compacting activity older than {cutoff.isoformat()}")
+
+        for label, compact in (("login activity", compact_login_activity), ("topic access", compact_topic_access_logs)):
+            total = 0
+            while True:
+                removed = compact(cutoff, options['chunk_size'])
+                if not removed:
+                    break
+                total += removed
+                time.sleep(options['sleep'])
+            self.stdout.write(self.style.SUCCESS(f"Compacted {total} {label} row(s)."))
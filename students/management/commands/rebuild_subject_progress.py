@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from students.utils import rebuild_subject_progress
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the SubjectProgressSummary counters from Topic and TopicProgress."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, nargs='+', dest='student_ids', help="Only rebuild these student profile ids")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_subject_progress(options['student_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} subject progress summaries."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from students.utils import recompute_learning_streaks
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored learning streaks from the StudentLoginActivity log."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, nargs='+', dest='student_ids', help="Only recompute these student profile ids")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        streaks = recompute_learning_streaks(options['student_ids'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed learning streaks for {len(streaks)} student(s)."))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0004_alter_classmodel_school'),
+        ('students', '0004_alter_studentprofile_school'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubjectProgressSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_topics', models.PositiveIntegerField(default=0)),
+                ('completed_topics', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subject_progress', to='students.studentprofile')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_summaries', to='v1.subject')),
+            ],
+            options={
+                'unique_together': {('student', 'subject')},
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0005_subjectprogresssummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearningStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('longest_streak', models.PositiveIntegerField(default=0)),
+                ('last_active_date', models.DateField(blank=True, null=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='learning_streak', to='students.studentprofile')),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:06
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_learningstreak'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentloginactivity',
+            name='login_time',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='topicaccesslog',
+            name='accessed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='studentloginactivity',
+            index=models.Index(fields=['student', 'login_time'], name='students_st_student_6a0bcc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topicaccesslog',
+            index=models.Index(fields=['student', 'accessed_at'], name='students_to_student_28403d_idx'),
+        ),
+    ]
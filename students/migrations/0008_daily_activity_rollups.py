@@ -0,0 +1,45 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0004_alter_classmodel_school'),
+        ('students', '0007_activity_log_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTopicAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('access_count', models.PositiveIntegerField(default=0)),
+                ('first_accessed_at', models.DateTimeField()),
+                ('last_accessed_at', models.DateTimeField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_topic_access', to='students.studentprofile')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_access', to='v1.topic')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['topic', 'date'], name='students_da_topic_i_8bb1f9_idx')],
+                'unique_together': {('student', 'topic', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyLoginSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('login_count', models.PositiveIntegerField(default=0)),
+                ('first_login_at', models.DateTimeField()),
+                ('last_login_at', models.DateTimeField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_logins', to='students.studentprofile')),
+            ],
+            options={
+                'unique_together': {('student', 'date')},
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from users.models import CustomUser
 from school.models import SchoolProfile
 
@@ -77,7 +78,11 @@ class ContentProgress(models.Model):
 
 class StudentLoginActivity(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='login_activities')
-    login_time = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: rows are buffered by students.events and carry the time of the login itself
+    login_time = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['student', 'login_time'])]
 
     def __str__(self):
         return f"{self.student.user.full_name} logged in at {self.login_time}"
@@ -87,13 +92,87 @@ class StudentLoginActivity(models.Model):
 
 
 
+class LearningStreak(models.Model):
+    """Consecutive login days per student, advanced on each login by students.utils.record_login_day."""
+    student = models.OneToOneField(StudentProfile, on_delete=models.CASCADE, related_name='learning_streak')
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    last_active_date = models.DateField(blank=True, null=True)  # local date in settings.TIME_ZONE
+
+    def __str__(self):
+        return f"{self.student.user.full_name}: {self.current_streak} day(s) (best {self.longest_streak})"
+
+
+
+
+
+
 class TopicAccessLog(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='topic_access_logs')
     topic = models.ForeignKey('v1.Topic', on_delete=models.CASCADE, related_name='access_logs')
-    accessed_at = models.DateTimeField(auto_now_add=True)
+    accessed_at = models.DateTimeField(default=timezone.now)  # set at access time, see students.events
+
+    class Meta:
+        indexes = [models.Index(fields=['student', 'accessed_at'])]
 
     def __str__(self):
         return f"{self.student.user.full_name} accessed {self.topic.title} at {self.accessed_at}"
 
 
 
+
+
+
+class SubjectProgressSummary(models.Model):
+    """Denormalized topic counters per (student, subject), kept in sync by students.utils."""
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='subject_progress')
+    subject = models.ForeignKey('v1.Subject', on_delete=models.CASCADE, related_name='progress_summaries')
+    total_topics = models.PositiveIntegerField(default=0)
+    completed_topics = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('student', 'subject')
+
+    def __str__(self):
+        return f"{self.student.user.full_name} → {self.subject.name} ({self.completed_topics}/{self.total_topics})"
+
+
+
+
+
+
+class DailyLoginSummary(models.Model):
+    """Daily rollup of StudentLoginActivity rows pruned by the prune_activity_logs command."""
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='daily_logins')
+    date = models.DateField()  # local date in settings.TIME_ZONE
+    login_count = models.PositiveIntegerField(default=0)
+    first_login_at = models.DateTimeField()
+    last_login_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('student', 'date')
+
+    def __str__(self):
+        return f"{self.student.user.full_name} logged in {self.login_count} time(s) on {self.date}"
+
+
+
+
+
+
+class DailyTopicAccess(models.Model):
+    """Daily rollup of TopicAccessLog rows pruned by the prune_activity_logs command."""
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='daily_topic_access')
+    topic = models.ForeignKey('v1.Topic', on_delete=models.CASCADE, related_name='daily_access')
+    date = models.DateField()  # local date in settings.TIME_ZONE
+    access_count = models.PositiveIntegerField(default=0)
+    first_accessed_at = models.DateTimeField()
+    last_accessed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('student', 'topic', 'date')
+        indexes = [models.Index(fields=['topic', 'date'])]
+
+    def __str__(self):
+        return f"{self.student.user.full_name} accessed {self.topic.title} {self.access_count} time(s) on {self.date}"
@@ -35,6 +35,23 @@ class StudentCreateSerializer(serializers.ModelSerializer):
 
 
 
+class StudentImportRowSerializer(serializers.ModelSerializer):
+    """One CSV row of a bulk student import (see students.imports)."""
+    full_name = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
+    class_id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = StudentProfile
+        fields = [
+            'full_name', 'email', 'roll_number', 'guardian_name',
+            'contact_number', 'date_of_birth', 'gender', 'address',
+            'admission_date', 'class_id'
+        ]
+
+
+
+
 
 class ContentProgressSerializer(serializers.Serializer):
     content_id = serializers.IntegerField()
@@ -76,6 +93,14 @@ class StudentLastLoginSerializer(serializers.ModelSerializer):
         fields = ['login_time']
 
 
+class TopicAccessHistorySerializer(serializers.Serializer):
+    topic_id = serializers.IntegerField()
+    topic_title = serializers.CharField()
+    date = serializers.DateField()
+    access_count = serializers.IntegerField()
+    last_accessed_at = serializers.DateTimeField()
+
+
 
 
 class StudentProfileSerializer(serializers.ModelSerializer):
@@ -96,9 +121,20 @@ class TopicSerializer(serializers.ModelSerializer):
         fields = ["id", "title", "number", "description", "is_completed"]
 
 class GetContentSerializer(serializers.ModelSerializer):
+    text_digest = serializers.CharField(source="body_id", read_only=True)
+    text_content = serializers.CharField(read_only=True, allow_null=True)
+
     class Meta:
         model = Content
-        fields = ["id", "title", "video_link", "text_content", "order", "is_active", "is_completed"]
+        fields = ["id", "title", "video_link", "text_digest", "text_length", "text_content", "order", "is_active", "is_completed"]
+
+    def get_fields(self):
+        # The (possibly long) body is only inlined with context "include_text_content";
+        # otherwise clients fetch it by text_digest from the content body endpoint
+        fields = super().get_fields()
+        if not self.context.get("include_text_content", False):
+            fields.pop("text_content")
+        return fields
 
 class TopicWithContentSerializer(serializers.ModelSerializer):
     contents = GetContentSerializer(many=True, read_only=True)
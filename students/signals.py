@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from students.models import SubjectProgressSummary, TopicProgress
+from students.course_tree import bump_tree_version
+from students.utils import adjust_completed_topics, adjust_total_topics, move_subject_progress
+from v1.models import Chapter, Content, Subject, Topic
+
+
+@receiver(post_save, sender=Subject)
+def create_subject_progress_summary(sender, instance, created, **kwargs):
+    if created:
+        SubjectProgressSummary.objects.get_or_create(student_id=instance.student_id, subject=instance)
+
+
+@receiver(post_save, sender=Topic)
+def count_added_topic(sender, instance, created, **kwargs):
+    if created:
+        subject_id = Chapter.objects.filter(id=instance.chapter_id).values_list('subject_id', flat=True).first()
+        if subject_id is not None:
+            adjust_total_topics(subject_id, 1)
+
+
+@receiver(post_delete, sender=Topic)
+def count_removed_topic(sender, instance, **kwargs):
+    # Cascades delete topics before their chapter, so the chapter row is still there
+    subject_id = Chapter.objects.filter(id=instance.chapter_id).values_list('subject_id', flat=True).first()
+    if subject_id is not None:
+        adjust_total_topics(subject_id, -1)
+
+
+# Moving a chapter or topic to another subject carries its topics' counters along. The
+# previous subject comes from the pre_save receivers below; topic ids are read now, so
+# topics added to a moved chapter later in the same transaction are not moved twice.
+def move_subject_progress_on_commit(topic_ids, from_subject_id, to_subject_id):
+    if topic_ids and from_subject_id is not None and from_subject_id != to_subject_id:
+        transaction.on_commit(lambda: move_subject_progress(topic_ids, from_subject_id, to_subject_id))
+
+
+@receiver(post_save, sender=Chapter)
+def move_progress_with_chapter(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_subject_id', None)
+    if not created and previous is not None and previous != instance.subject_id:
+        topic_ids = list(Topic.objects.filter(chapter_id=instance.id).values_list('id', flat=True))
+        move_subject_progress_on_commit(topic_ids, previous, instance.subject_id)
+
+
+@receiver(post_save, sender=Topic)
+def move_progress_with_topic(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_subject_id', None)
+    if not created and previous is not None:
+        move_subject_progress_on_commit([instance.id], previous, chapter_subject_id(instance.chapter_id))
+
+
+@receiver(post_delete, sender=TopicProgress)
+def count_removed_topic_progress(sender, instance, **kwargs):
+    if instance.is_completed:
+        subject_id = Topic.objects.filter(id=instance.topic_id).values_list('chapter__subject_id', flat=True).first()
+        if subject_id is not None:
+            adjust_completed_topics(instance.student_id, subject_id, -1)
+
+
+# Cached course trees (students.course_tree) are versioned per subject. Versions are
+# bumped on commit, so no reader can cache the old tree under the new version. Moves
+# bump the previous subject too, which pre_save looks up before the row changes.
+# Cascades delete contents and topics before their chapter, so the parent rows are
+# still there when they are looked up.
+def bump_tree_versions_on_commit(*subject_ids):
+    subject_ids = {subject_id for subject_id in subject_ids if subject_id is not None}
+
+    def bump():
+        for subject_id in subject_ids:
+            bump_tree_version(subject_id)
+    transaction.on_commit(bump)
+
+
+def topic_subject_id(topic_id):
+    return Topic.objects.filter(id=topic_id).values_list('chapter__subject_id', flat=True).first()
+
+
+def chapter_subject_id(chapter_id):
+    return Chapter.objects.filter(id=chapter_id).values_list('subject_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Subject)
+def bump_tree_on_subject_change(sender, instance, **kwargs):
+    # The tree embeds the subject's name, code and description
+    bump_tree_versions_on_commit(instance.id)
+
+
+@receiver(pre_save, sender=Chapter)
+def remember_chapter_subject(sender, instance, **kwargs):
+    instance._previous_subject_id = chapter_subject_id(instance.pk) if instance.pk else None
+
+
+@receiver(pre_save, sender=Topic)
+def remember_topic_subject(sender, instance, **kwargs):
+    instance._previous_subject_id = topic_subject_id(instance.pk) if instance.pk else None
+
+
+@receiver(pre_save, sender=Content)
+def remember_content_subject(sender, instance, **kwargs):
+    instance._previous_subject_id = (
+        Content.objects.filter(id=instance.pk).values_list('topic__chapter__subject_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+def bump_tree_on_chapter_change(sender, instance, **kwargs):
+    bump_tree_versions_on_commit(instance.subject_id, getattr(instance, '_previous_subject_id', None))
+
+
+@receiver([post_save, post_delete], sender=Topic)
+def bump_tree_on_topic_change(sender, instance, **kwargs):
+    bump_tree_versions_on_commit(chapter_subject_id(instance.chapter_id), getattr(instance, '_previous_subject_id', None))
+
+
+@receiver([post_save, post_delete], sender=Content)
+def bump_tree_on_content_change(sender, instance, **kwargs):
+    bump_tree_versions_on_commit(topic_subject_id(instance.topic_id), getattr(instance, '_previous_subject_id', None))
@@ -1,3 +1,195 @@
-from django.test import TestCase
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from school.models import SchoolProfile
+from students.events import BUFFERS
+from students.models import (
+    DailyLoginSummary, DailyTopicAccess, LearningStreak, StudentLoginActivity, StudentProfile,
+    SubjectProgressSummary, TopicAccessLog, TopicProgress
+)
+from students.utils import find_subject_progress_drift, recompute_learning_streaks, record_login_day
+from users.models import CustomUser
+from v1.models import Chapter, Subject, Topic
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+IST = ZoneInfo('Asia/Kolkata')
+
+
+def make_student(school, index):
+    user = CustomUser.objects.create_user(email=f's{index}@example.com', password='p', full_name=f'S{index}', role='student')
+    return StudentProfile.objects.create(user=user, school=school, roll_number=str(index), guardian_name='g', contact_number='1')
+
+
+def make_school():
+    user = CustomUser.objects.create_user(email='school@example.com', password='p', full_name='School', role='school')
+    return SchoolProfile.objects.create(user=user, name='School', address='a', phone_number='1', registration_number='R1')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SubjectProgressCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Write activity rows straight away, inside the test's transaction
+        for buffer in BUFFERS:
+            patcher = mock.patch.object(buffer, 'max_size', 1)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.student = make_student(make_school(), 0)
+        self.math = Subject.objects.create(student=self.student, name='Math')
+        self.science = Subject.objects.create(student=self.student, name='Science')
+        self.algebra = Chapter.objects.create(subject=self.math, title='Algebra', number=1)
+        self.optics = Chapter.objects.create(subject=self.science, title='Optics', number=2)
+        self.topics = [Topic.objects.create(chapter=self.algebra, title=f'T{i}', number=i) for i in range(3)]
+        Topic.objects.create(chapter=self.optics, title='Lenses', number=1)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.student.user)
+
+    def counters(self, subject):
+        summary = SubjectProgressSummary.objects.get(student=self.student, subject=subject)
+        return summary.total_topics, summary.completed_topics
+
+    def mark(self, topic, is_completed):
+        response = self.client.post('/api/v1/students/progress/topic/', {
+            'topic_id': topic.id, 'completion_percentage': 100.0 if is_completed else 50.0, 'is_completed': is_completed,
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def assertNoDrift(self):
+        self.assertEqual(find_subject_progress_drift(), [])
+
+    def test_topic_create_and_delete_adjust_totals(self):
+        self.assertEqual(self.counters(self.math), (3, 0))
+        self.topics[0].delete()
+        self.assertEqual(self.counters(self.math), (2, 0))
+        self.assertNoDrift()
+
+    def test_completion_is_counted_once(self):
+        self.mark(self.topics[0], True)
+        self.mark(self.topics[0], True)
+        self.assertEqual(self.counters(self.math), (3, 1))
+
+        self.mark(self.topics[0], False)
+        self.assertEqual(self.counters(self.math), (3, 0))
+        self.assertNoDrift()
+
+    def test_deleting_completed_progress_decrements(self):
+        self.mark(self.topics[1], True)
+        TopicProgress.objects.filter(topic=self.topics[1]).delete()
+        self.assertEqual(self.counters(self.math), (3, 0))
+        self.assertNoDrift()
+
+    def test_moving_a_chapter_moves_its_counters(self):
+        self.mark(self.topics[0], True)
+        self.mark(self.topics[1], True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.algebra.subject = self.science
+            self.algebra.save()
+
+        self.assertEqual(self.counters(self.math), (0, 0))
+        self.assertEqual(self.counters(self.science), (4, 2))
+        self.assertNoDrift()
+
+    def test_moving_a_topic_moves_its_counters(self):
+        self.mark(self.topics[2], True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topics[2].chapter = self.optics
+            self.topics[2].save()
+
+        self.assertEqual(self.counters(self.math), (2, 0))
+        self.assertEqual(self.counters(self.science), (2, 1))
+        self.assertNoDrift()
+
+    def test_moving_within_a_subject_changes_nothing(self):
+        other = Chapter.objects.create(subject=self.math, title='Geometry', number=3)
+        self.mark(self.topics[0], True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.topics[0].chapter = other
+            self.topics[0].save()
+
+        self.assertEqual(self.counters(self.math), (3, 1))
+        self.assertNoDrift()
+
+
+class LearningStreakTests(TestCase):
+    def setUp(self):
+        self.student = make_student(make_school(), 0)
+
+    def login(self, day, hour=9):
+        login_time = datetime(2026, 1, day, hour, tzinfo=IST)
+        StudentLoginActivity.objects.create(student=self.student, login_time=login_time)
+        return record_login_day(self.student, login_time)
+
+    def test_consecutive_days_extend_and_gaps_reset(self):
+        self.login(1, 23)
+        streak = self.login(2, 0)  # 30 minutes later, but the next local day
+        self.assertEqual((streak.current_streak, streak.longest_streak), (2, 2))
+
+        streak = self.login(2, 18)
+        self.assertEqual(streak.current_streak, 2)
+
+        self.login(3)
+        streak = self.login(5)
+        self.assertEqual((streak.current_streak, streak.longest_streak, streak.last_active_date), (1, 3, date(2026, 1, 5)))
+
+    def test_recompute_matches_the_incremental_streak(self):
+        for day in (1, 2, 3, 5, 6):
+            incremental = self.login(day)
+
+        LearningStreak.objects.all().delete()
+        recomputed = recompute_learning_streaks([self.student.id])[self.student.id]
+        self.assertEqual(
+            (recomputed.current_streak, recomputed.longest_streak, recomputed.last_active_date),
+            (incremental.current_streak, incremental.longest_streak, incremental.last_active_date),
+        )
+
+    def test_dashboard_stores_an_empty_streak_once(self):
+        client = APIClient()
+        for _ in range(2):
+            response = client.get(f'/api/v1/students/dashboard/{self.student.user_id}/')
+            self.assertEqual(response.json()['learning_streak'], 0)
+        self.assertEqual(LearningStreak.objects.filter(student=self.student).count(), 1)
+
+
+class ActivityRollupTests(TestCase):
+    def setUp(self):
+        self.student = make_student(make_school(), 0)
+        subject = Subject.objects.create(student=self.student, name='Math')
+        chapter = Chapter.objects.create(subject=subject, title='Algebra', number=1)
+        self.topic = Topic.objects.create(chapter=chapter, title='T', number=1)
+
+    def test_compaction_keeps_counts_and_history(self):
+        now = timezone.now()
+        for days_ago in (0, 0, 5, 5, 5):
+            TopicAccessLog.objects.create(student=self.student, topic=self.topic, accessed_at=now - timedelta(days=days_ago))
+            StudentLoginActivity.objects.create(student=self.student, login_time=now - timedelta(days=days_ago))
+
+        call_command('prune_activity_logs', '--days', '3', stdout=StringIO())
+
+        self.assertEqual(TopicAccessLog.objects.count(), 2)
+        self.assertEqual(StudentLoginActivity.objects.count(), 2)
+        rollup = DailyTopicAccess.objects.get()
+        self.assertEqual((rollup.date, rollup.access_count), (timezone.localdate(now - timedelta(days=5)), 3))
+        self.assertEqual(DailyLoginSummary.objects.get().login_count, 3)
+
+        history = APIClient().get(f'/api/v1/students/topic-access/{self.student.id}/?days=7').json()
+        self.assertEqual([entry['access_count'] for entry in history], [2, 3])
+
+    def test_compaction_merges_into_existing_rollups(self):
+        old = timezone.now() - timedelta(days=10)
+        for _ in range(2):
+            TopicAccessLog.objects.create(student=self.student, topic=self.topic, accessed_at=old)
+            call_command('prune_activity_logs', '--days', '3', stdout=StringIO())
+        self.assertEqual(DailyTopicAccess.objects.get().access_count, 2)
@@ -0,0 +1,326 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from students.models import (
+    DailyLoginSummary, DailyTopicAccess, LearningStreak, StudentLoginActivity,
+    SubjectProgressSummary, TopicAccessLog, TopicProgress
+)
+from school.utils import month_key, record_active_student
+from v1.models import Subject, Topic
+
+
+def adjust_completed_topics(student_id, subject_id, delta):
+    """
+    Add delta to the completed topic counter of a (student, subject) pair.
+
+    When a topic gets completed for a pair that has no summary row yet, the row is
+    created from fresh counts, which already include the change being recorded.
+    Decrements never create rows: they also run while cascades delete the student.
+    """
+    summaries = SubjectProgressSummary.objects.filter(student_id=student_id, subject_id=subject_id)
+    if delta < 0:
+        summaries.filter(completed_topics__gte=-delta).update(completed_topics=F('completed_topics') + delta)
+        return
+    if summaries.update(completed_topics=F('completed_topics') + delta):
+        return
+
+    total, completed = count_subject_progress(student_id, subject_id)
+    SubjectProgressSummary.objects.update_or_create(
+        student_id=student_id, subject_id=subject_id,
+        defaults={'total_topics': total, 'completed_topics': completed},
+    )
+
+
+def adjust_total_topics(subject_id, delta):
+    """Add delta to the total topic counter of every summary of a subject."""
+    summaries = SubjectProgressSummary.objects.filter(subject_id=subject_id)
+    if delta < 0:
+        summaries = summaries.filter(total_topics__gte=-delta)
+    summaries.update(total_topics=F('total_topics') + delta)
+
+
+def move_subject_progress(topic_ids, from_subject_id, to_subject_id):
+    """
+    Move the counters of topics that now belong to another subject (a chapter or topic moved).
+
+    Totals move first: a summary row that adjust_completed_topics has to create for the
+    new subject is counted from scratch and already includes the moved topics.
+    """
+    if not topic_ids or from_subject_id == to_subject_id:
+        return
+
+    with transaction.atomic():
+        if from_subject_id is not None:
+            adjust_total_topics(from_subject_id, -len(topic_ids))
+        if to_subject_id is not None:
+            adjust_total_topics(to_subject_id, len(topic_ids))
+
+        completed = (
+            TopicProgress.objects.filter(topic_id__in=topic_ids, is_completed=True)
+            .values_list('student_id').annotate(done=Count('id')).order_by()
+        )
+        for student_id, done in completed:
+            if from_subject_id is not None:
+                adjust_completed_topics(student_id, from_subject_id, -done)
+            if to_subject_id is not None:
+                adjust_completed_topics(student_id, to_subject_id, done)
+
+
+def count_subject_progress(student_id, subject_id):
+    """Count (total_topics, completed_topics) of one pair straight from the source tables."""
+    total = Topic.objects.filter(chapter__subject_id=subject_id).count()
+    completed = TopicProgress.objects.filter(
+        student_id=student_id, topic__chapter__subject_id=subject_id, is_completed=True
+    ).count()
+    return total, completed
+
+
+def compute_subject_progress(student_ids=None):
+    """
+    Recompute every (student, subject) counter with two GROUP BY queries.
+
+    Covers each subject's owning student plus any student with completed topics in it.
+    Returns {(student_id, subject_id): (total_topics, completed_topics)}.
+    """
+    totals = dict(
+        Topic.objects.values_list('chapter__subject_id').annotate(total=Count('id')).order_by()
+    )
+
+    completed = TopicProgress.objects.filter(is_completed=True)
+    subjects = Subject.objects.all()
+    if student_ids is not None:
+        completed = completed.filter(student_id__in=student_ids)
+        subjects = subjects.filter(student_id__in=student_ids)
+
+    progress = {
+        (student_id, subject_id): (totals.get(subject_id, 0), 0)
+        for subject_id, student_id in subjects.values_list('id', 'student_id')
+    }
+    rows = completed.values_list('student_id', 'topic__chapter__subject_id').annotate(done=Count('id')).order_by()
+    for student_id, subject_id, done in rows:
+        progress[(student_id, subject_id)] = (totals.get(subject_id, 0), done)
+    return progress
+
+
+def rebuild_subject_progress(student_ids=None, batch_size=1000):
+    """Replace the summary rows (of the given students, or all) with freshly computed ones."""
+    progress = compute_subject_progress(student_ids)
+
+    with transaction.atomic():
+        existing = SubjectProgressSummary.objects.all()
+        if student_ids is not None:
+            existing = existing.filter(student_id__in=student_ids)
+        existing.delete()
+        SubjectProgressSummary.objects.bulk_create([
+            SubjectProgressSummary(student_id=student_id, subject_id=subject_id, total_topics=total, completed_topics=done)
+            for (student_id, subject_id), (total, done) in progress.items()
+        ], batch_size=batch_size)
+    return len(progress)
+
+
+def find_subject_progress_drift(student_ids=None):
+    """
+    Compare the stored summaries with freshly computed counters.
+
+    Returns a list of (student_id, subject_id, stored, expected) where stored/expected are
+    (total_topics, completed_topics) tuples, or None when the row is missing / unexpected.
+    """
+    expected = compute_subject_progress(student_ids)
+
+    stored_rows = SubjectProgressSummary.objects.all()
+    if student_ids is not None:
+        stored_rows = stored_rows.filter(student_id__in=student_ids)
+    stored = {
+        (student_id, subject_id): (total, done)
+        for student_id, subject_id, total, done in stored_rows.values_list(
+            'student_id', 'subject_id', 'total_topics', 'completed_topics'
+        )
+    }
+
+    drift = []
+    for key in expected.keys() | stored.keys():
+        # Rows created on demand for progress that was later undone are fine as long as they count zero
+        if key not in expected and stored[key][1] == 0:
+            continue
+        if stored.get(key) != expected.get(key):
+            drift.append((key[0], key[1], stored.get(key), expected.get(key)))
+    return sorted(drift)
+
+
+def advance_streak(streak, day):
+    """
+    Fold one active day into a LearningStreak instance (no save).
+
+    Repeated logins on the same day and days older than the last active one are ignored.
+    """
+    last = streak.last_active_date
+    if last is not None and day <= last:
+        return streak
+    if last is not None and day - last == timedelta(days=1):
+        streak.current_streak += 1
+    else:
+        streak.current_streak = 1
+    streak.longest_streak = max(streak.longest_streak, streak.current_streak)
+    streak.last_active_date = day
+    return streak
+
+
+def record_login_day(student, login_time=None):
+    """
+    Advance a student's stored streak for a login, in O(1) regardless of login history.
+
+    The first login of a month also counts the student as active in that month
+    of the school's dashboard summary.
+    """
+    day = timezone.localdate(login_time)  # day boundary of settings.TIME_ZONE
+
+    with transaction.atomic():
+        streak, _ = LearningStreak.objects.select_for_update().get_or_create(student=student)
+        previous = streak.last_active_date
+        advance_streak(streak, day)
+        if streak.last_active_date != previous:
+            streak.save()
+            if previous is None or month_key(previous) != month_key(day):
+                record_active_student(student.school_id, day)
+    return streak
+
+
+def recompute_learning_streaks(student_ids=None, chunk_size=2000):
+    """
+    Rebuild LearningStreak rows from the login history.
+
+    Days already compacted into DailyLoginSummary are read from there, the rest
+    from the raw StudentLoginActivity log.
+    """
+    summaries = DailyLoginSummary.objects.all()
+    logins = StudentLoginActivity.objects.all()
+    if student_ids is not None:
+        summaries = summaries.filter(student_id__in=student_ids)
+        logins = logins.filter(student_id__in=student_ids)
+
+    active_days = {}
+    for student_id, day in summaries.values_list('student_id', 'date').iterator(chunk_size=chunk_size):
+        active_days.setdefault(student_id, set()).add(day)
+    for student_id, login_time in logins.values_list('student_id', 'login_time').iterator(chunk_size=chunk_size):
+        active_days.setdefault(student_id, set()).add(timezone.localdate(login_time))
+
+    streaks = {}
+    for student_id, days in active_days.items():
+        streak = streaks[student_id] = LearningStreak(student_id=student_id)
+        for day in sorted(days):
+            advance_streak(streak, day)
+
+    with transaction.atomic():
+        existing = LearningStreak.objects.all()
+        if student_ids is not None:
+            existing = existing.filter(student_id__in=student_ids)
+        existing.delete()
+        LearningStreak.objects.bulk_create(streaks.values(), batch_size=1000)
+    return streaks
+
+
+def retention_cutoff(days):
+    """Local midnight `days` days ago: raw activity rows older than this get compacted."""
+    start_of_today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return start_of_today - timedelta(days=days)
+
+
+def _compact_chunk(log_model, time_field, key_fields, summary_model, count_field, first_field, last_field,
+                   cutoff, chunk_size):
+    """
+    Roll the oldest chunk of raw log rows into daily summary rows and delete them.
+
+    Aggregation and deletion share one short transaction, so an interrupted run
+    never counts a row twice or loses it. Returns the number of raw rows removed.
+    """
+    with transaction.atomic():
+        rows = list(
+            log_model.objects.filter(**{f'{time_field}__lt': cutoff}).order_by('id')
+            .values_list('id', *key_fields, time_field)[:chunk_size]
+        )
+        if not rows:
+            return 0
+
+        groups = {}
+        for _, *keys, at in rows:
+            key = (*keys, timezone.localdate(at))
+            count, first, last = groups.get(key, (0, at, at))
+            groups[key] = (count + 1, min(first, at), max(last, at))
+
+        days = [key[-1] for key in groups]
+        existing = {
+            (*(getattr(summary, f'{field}_id') for field in key_fields), summary.date): summary
+            for summary in summary_model.objects.filter(
+                student_id__in={key[0] for key in groups}, date__range=(min(days), max(days))
+            )
+        }
+
+        to_create, to_update = [], []
+        for key, (count, first, last) in groups.items():
+            summary = existing.get(key)
+            if summary is None:
+                fields = {f'{field}_id': value for field, value in zip(key_fields, key)}
+                to_create.append(summary_model(
+                    date=key[-1], **fields, **{count_field: count, first_field: first, last_field: last}
+                ))
+            else:
+                setattr(summary, count_field, getattr(summary, count_field) + count)
+                setattr(summary, first_field, min(getattr(summary, first_field), first))
+                setattr(summary, last_field, max(getattr(summary, last_field), last))
+                to_update.append(summary)
+
+        summary_model.objects.bulk_create(to_create)
+        summary_model.objects.bulk_update(to_update, [count_field, first_field, last_field])
+
+        # Rows are picked in id order, so an id range removes exactly this chunk
+        log_model.objects.filter(**{f'{time_field}__lt': cutoff}, id__lte=rows[-1][0]).delete()
+    return len(rows)
+
+
+def compact_login_activity(cutoff, chunk_size=5000):
+    return _compact_chunk(
+        StudentLoginActivity, 'login_time', ['student'], DailyLoginSummary,
+        'login_count', 'first_login_at', 'last_login_at', cutoff, chunk_size,
+    )
+
+
+def compact_topic_access_logs(cutoff, chunk_size=5000):
+    return _compact_chunk(
+        TopicAccessLog, 'accessed_at', ['student', 'topic'], DailyTopicAccess,
+        'access_count', 'first_accessed_at', 'last_accessed_at', cutoff, chunk_size,
+    )
+
+
+def topic_access_history(student_id, since):
+    """
+    Per-topic, per-day access counts of a student from the local date `since` on.
+
+    Days already compacted come from DailyTopicAccess and the rest from the raw
+    TopicAccessLog, so the history does not end at the retention window. A day
+    still partly in the raw log (compaction runs in chunks) is merged from both.
+    """
+    days = {}
+    for summary in DailyTopicAccess.objects.filter(student_id=student_id, date__gte=since):
+        days[(summary.topic_id, summary.date)] = [summary.access_count, summary.last_accessed_at]
+
+    start = timezone.make_aware(datetime.combine(since, time.min))
+    logs = TopicAccessLog.objects.filter(student_id=student_id, accessed_at__gte=start)
+    for topic_id, accessed_at in logs.values_list('topic_id', 'accessed_at'):
+        day = days.setdefault((topic_id, timezone.localdate(accessed_at)), [0, accessed_at])
+        day[0] += 1
+        day[1] = max(day[1], accessed_at)
+
+    topic_titles = dict(Topic.objects.filter(id__in={topic_id for topic_id, _ in days}).values_list('id', 'title'))
+    return [
+        {
+            'topic_id': topic_id,
+            'topic_title': topic_titles.get(topic_id),
+            'date': day,
+            'access_count': count,
+            'last_accessed_at': last,
+        }
+        for (topic_id, day), (count, last) in sorted(days.items(), key=lambda item: (item[0][1], item[0][0]), reverse=True)
+    ]
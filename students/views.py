@@ -1,14 +1,29 @@
-from rest_framework.decorators import api_view, permission_classes
+import csv
+
+from rest_framework.decorators import api_view, permission_classes, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from .serializers import ChapterSerializer, StudentCreateSerializer, ContentProgressSerializer, TopicProgressSerializer, LastAccessedTopicSerializer, StudentLastLoginSerializer, StudentProfileSerializer, TopicSerializer, TopicWithContentSerializer, GetContentSerializer
-from students.models import ContentProgress, TopicProgress, TopicAccessLog, StudentLoginActivity, StudentProfile, StudentClassAssignment
+from .serializers import ChapterSerializer, StudentCreateSerializer, ContentProgressSerializer, TopicProgressSerializer, LastAccessedTopicSerializer, StudentLastLoginSerializer, TopicAccessHistorySerializer, StudentProfileSerializer, TopicSerializer, TopicWithContentSerializer, GetContentSerializer
+from students.models import ContentProgress, TopicProgress, StudentLoginActivity, StudentProfile, StudentClassAssignment, SubjectProgressSummary, LearningStreak, DailyLoginSummary
+from students.events import login_activity_buffer, topic_access_buffer
+from lms.caching import apply_cache_policy, cache_policy
+from students.course_tree import (
+    chapter_topics_with_contents, get_subject_tree, include_text_content, requesting_student_id,
+    subject_tree_for_student, with_student_progress
+)
+from students.imports import import_students
+from users.utils import read_csv_rows
+from students.utils import adjust_completed_topics, count_subject_progress, record_login_day, recompute_learning_streaks, topic_access_history
 from v1.models import Content, Topic, Subject, Chapter, ClassModel
 from users.models import CustomUser
+from django.db.models import FilteredRelation, Q
+from django.db import transaction
+from django.utils import timezone
 from datetime import timedelta
 
 
@@ -41,6 +56,54 @@ def create_student(request, school_user_id):
 
 
 
+@swagger_auto_schema(
+    method='post',
+    manual_parameters=[
+        openapi.Parameter(
+            'file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+            description="CSV with a header row: full_name, email, roll_number, guardian_name, contact_number "
+                        "and optionally date_of_birth, gender, address, admission_date, class_id"
+        ),
+        openapi.Parameter(
+            'skip_invalid', openapi.IN_FORM, type=openapi.TYPE_BOOLEAN,
+            description="Import the valid rows even when some rows have errors"
+        ),
+    ],
+    responses={201: "Students imported", 400: "Per-row validation errors", 404: "School not found"}
+)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@parser_classes([MultiPartParser, FormParser])
+def bulk_import_students(request, school_user_id):
+    try:
+        school_user = CustomUser.objects.get(id=school_user_id, role='school')
+        school = school_user.school_profile
+    except CustomUser.DoesNotExist:
+        return Response({"error": "School user not found."}, status=status.HTTP_404_NOT_FOUND)
+    except Exception:
+        return Response({"error": "School profile not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({"error": "Upload the CSV as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        rows = read_csv_rows(upload)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        return Response({"error": f"Could not read the CSV: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    skip_invalid = str(request.data.get('skip_invalid', '')).lower() in ('1', 'true', 'yes')
+    created, errors = import_students(school, rows, skip_invalid=skip_invalid)
+
+    if errors and not skip_invalid:
+        return Response({"status": False, "created": 0, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"status": True, "created": created, "errors": errors}, status=status.HTTP_201_CREATED)
+
+
+
+
+
+
 @swagger_auto_schema(
     method='post',
     request_body=ContentProgressSerializer,
@@ -60,7 +123,6 @@ def mark_content_progress(request):
         )
         progress.is_completed = data['is_completed']
         if data['is_completed']:
-            from django.utils import timezone
             progress.completed_at = timezone.now()
         progress.save()
         return Response({"message": "Content progress updated."})
@@ -82,17 +144,23 @@ def mark_topic_progress(request):
     if serializer.is_valid():
         data = serializer.validated_data
         student = request.user.student_profile
-        topic = Topic.objects.get(id=data['topic_id'])
+        topic = Topic.objects.select_related('chapter').get(id=data['topic_id'])
 
-        progress, _ = TopicProgress.objects.get_or_create(
-            student=student, topic=topic
-        )
-        progress.completion_percentage = data['completion_percentage']
-        progress.is_completed = data['is_completed']
-        progress.save()
+        # The row lock makes concurrent posts for one topic see each other's change, so
+        # the dashboard's per-subject counter moves once and commits with the progress
+        with transaction.atomic():
+            TopicProgress.objects.get_or_create(student=student, topic=topic)
+            progress = TopicProgress.objects.select_for_update().get(student=student, topic=topic)
+            was_completed = progress.is_completed
+            progress.completion_percentage = data['completion_percentage']
+            progress.is_completed = data['is_completed']
+            progress.save()
+
+            if progress.is_completed != was_completed:
+                adjust_completed_topics(student.id, topic.chapter.subject_id, 1 if progress.is_completed else -1)
 
-        # Log last accessed
-        TopicAccessLog.objects.create(student=student, topic=topic)
+        # Log last accessed (buffered, written in batches)
+        topic_access_buffer.add(student=student, topic=topic, accessed_at=timezone.now())
 
         return Response({"message": "Topic progress updated."})
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -130,6 +198,35 @@ def get_last_accessed_topics(request, student_id):
 
 
 
+@swagger_auto_schema(
+    method='get',
+    manual_parameters=[
+        openapi.Parameter('days', openapi.IN_QUERY, description="How many days back to report (default 30)", type=openapi.TYPE_INTEGER),
+    ],
+    responses={200: TopicAccessHistorySerializer(many=True)}
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_topic_access_history(request, student_id):
+    try:
+        student = StudentProfile.objects.get(id=student_id)
+    except StudentProfile.DoesNotExist:
+        return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        days = max(int(request.query_params.get('days', 30)), 1)
+    except ValueError:
+        return Response({"error": "days must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    serializer = TopicAccessHistorySerializer(topic_access_history(student.id, since), many=True)
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+
+
+
+
 @swagger_auto_schema(
     method='post',
     responses={200: "Login time recorded successfully"}
@@ -142,7 +239,9 @@ def store_student_login(request, student_id):
     except StudentProfile.DoesNotExist:
         return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    StudentLoginActivity.objects.create(student=student)
+    login_time = timezone.now()
+    login_activity_buffer.add(student=student, login_time=login_time)
+    record_login_day(student, login_time)
     return Response({"message": "Login time recorded successfully"}, status=status.HTTP_200_OK)
 
 
@@ -165,10 +264,19 @@ def get_last_login_info(request, student_id):
     except StudentProfile.DoesNotExist:
         return Response({"error": "Student not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    last_login = StudentLoginActivity.objects.filter(student=student).order_by('-login_time').first()
+    # Logins buffered by this process are not in the table yet; other processes' show up within MAX_AGE
+    candidates = login_activity_buffer.pending(student_id=student.id)
+    candidates.append(StudentLoginActivity.objects.filter(student=student).order_by('-login_time').first())
+    last_login = max(filter(None, candidates), key=lambda login: login.login_time, default=None)
     if last_login:
         serializer = StudentLastLoginSerializer(last_login)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+    # Raw rows past the retention window only survive as daily summaries
+    last_day = DailyLoginSummary.objects.filter(student=student).order_by('-date').first()
+    if last_day:
+        serializer = StudentLastLoginSerializer({"login_time": last_day.last_login_at})
+        return Response(serializer.data, status=status.HTTP_200_OK)
     return Response({"message": "No login record found."}, status=status.HTTP_404_NOT_FOUND)
 
 
@@ -310,11 +418,13 @@ def get_subject_chapters(request, subject_id):
 # 3. Get Topics + Contents for a Chapter
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@cache_policy('public', vary=['Authorization'])
 def get_chapter_topics(request, chapter_id):
-    topics = Topic.objects.filter(chapter_id=chapter_id).order_by("number")
+    with_text = include_text_content(request)
+    topics = chapter_topics_with_contents(chapter_id, with_text)
     data = []
     for t in topics:
-        contents = Content.objects.filter(topic=t, is_active=True).order_by("order")
+        contents = t.contents.all()
         data.append({
             "id": t.id,
             "title": t.title,
@@ -326,7 +436,9 @@ def get_chapter_topics(request, chapter_id):
                     "id": c.id,
                     "title": c.title,
                     "video_link": c.video_link,
-                    "text_content": c.text_content,
+                    "text_digest": c.body_id,
+                    "text_length": c.text_length,
+                    **({"text_content": c.text_content} if with_text else {}),
                     "order": c.order,
                     "is_active": c.is_active,
                     "is_completed": c.is_completed,
@@ -334,6 +446,10 @@ def get_chapter_topics(request, chapter_id):
                 for c in contents
             ]
         })
+
+    student_id = requesting_student_id(request)
+    if student_id is not None:
+        return apply_cache_policy(Response(with_student_progress(data, student_id)), 'private')
     return Response(data)
 
 
@@ -369,12 +485,12 @@ def get_chapter_topics(request, chapter_id):
 @permission_classes([AllowAny])
 def student_dashboard(request, user_id):
     try:
-        student = StudentProfile.objects.get(user_id=user_id)
+        student = StudentProfile.objects.select_related("learning_streak").get(user_id=user_id)
     except StudentProfile.DoesNotExist:
         return Response({"error": "Student profile not found"}, status=404)
 
     # 1. Recently accessed topics (limit 4)
-    recent_topics_qs = TopicProgress.objects.filter(student=student).order_by("-last_accessed")[:4]
+    recent_topics_qs = TopicProgress.objects.filter(student=student).select_related("topic__chapter").order_by("-last_accessed")[:4]
     recent_topics = [
         {
             "topic": tp.topic.title,
@@ -385,47 +501,39 @@ def student_dashboard(request, user_id):
         for tp in recent_topics_qs
     ]
 
-    # 2. Subjects with completion %
-    # 2. Subjects with completion %
-    subjects_qs = student.subjects.all()  # Related name on Subject: 'subjects'
+    # 2. Subjects with completion % (read from the denormalized SubjectProgressSummary counters)
+    subjects_qs = Subject.objects.filter(student=student).annotate(
+        summary=FilteredRelation('progress_summaries', condition=Q(progress_summaries__student=student))
+    ).values_list("id", "name", "summary__total_topics", "summary__completed_topics").order_by("id")
     subjects = []
 
-    for subj in subjects_qs:
-        # Total number of topics under this subject
-        total_topics = Topic.objects.filter(chapter__subject=subj).count()
-
-        # Number of topics the student has completed
-        completed_topics = TopicProgress.objects.filter(
-            student=student,
-            topic__chapter__subject=subj,
-            is_completed=True
-        ).count()
+    for subject_id, name, total_topics, completed_topics in subjects_qs:
+        if total_topics is None:
+            # No summary yet (subject predates the table and no rebuild has run): create it once
+            total_topics, completed_topics = count_subject_progress(student.id, subject_id)
+            SubjectProgressSummary.objects.get_or_create(
+                student=student, subject_id=subject_id,
+                defaults={"total_topics": total_topics, "completed_topics": completed_topics},
+            )
 
         # Completion percentage
         completion_percentage = (completed_topics / total_topics * 100) if total_topics > 0 else 0
 
         subjects.append({
-            "subject": subj.name,
+            "subject": name,
             "completion_percentage": round(completion_percentage, 2),
         })
 
 
-    # 3. Learning streak
-    streak = 0
-    login_dates = StudentLoginActivity.objects.filter(student=student).order_by("-login_time").values_list("login_time", flat=True)
-
-    if login_dates:
-        streak = 1
-        prev_date = login_dates[0].date()
-        for login in login_dates[1:]:
-            login_date = login.date()
-            if prev_date - login_date == timedelta(days=1):
-                streak += 1
-                prev_date = login_date
-            elif prev_date == login_date:
-                continue
-            else:
-                break
+    # 3. Learning streak (stored state, advanced by store_student_login)
+    try:
+        streak = student.learning_streak.current_streak
+    except LearningStreak.DoesNotExist:
+        streak = recompute_learning_streaks([student.id]).get(student.id)
+        if streak is None:
+            # No logins yet: store an empty streak so later hits don't rebuild it again
+            streak, _ = LearningStreak.objects.get_or_create(student=student)
+        streak = streak.current_streak
 
     # 4. Hardcoded reports
     reports = ["Performance Report", "Attendance Report", "Progress Report"]
@@ -465,6 +573,7 @@ def student_dashboard(request, user_id):
 )
 @api_view(["GET"])
 @permission_classes([])
+@cache_policy('public')
 def get_chapters_of_subject(request, subject_id):
     try:
         chapters = Chapter.objects.filter(subject_id=subject_id)
@@ -482,6 +591,7 @@ def get_chapters_of_subject(request, subject_id):
 )
 @api_view(["GET"])
 @permission_classes([])
+@cache_policy('public')
 def get_topics_of_chapter(request, chapter_id):
     try:
         topics = Topic.objects.filter(chapter_id=chapter_id)
@@ -495,16 +605,23 @@ def get_topics_of_chapter(request, chapter_id):
 @swagger_auto_schema(
     method="get",
     responses={200: GetContentSerializer(many=True)},
-    operation_description="Get all content of a topic"
+    operation_description=(
+        "Get all content of a topic. Bodies are returned as text_digest and text_length; "
+        "?expand=text_content includes the text itself."
+    )
 )
 @api_view(["GET"])
 @permission_classes([])
+@cache_policy('public')
 def get_content_of_topic(request, topic_id):
+    with_text = include_text_content(request)
     try:
         contents = Content.objects.filter(topic_id=topic_id)
+        if with_text:
+            contents = contents.select_related("body")
     except Topic.DoesNotExist:
         return Response({"error": "Topic not found"}, status=status.HTTP_404_NOT_FOUND)
-    serializer = GetContentSerializer(contents, many=True)
+    serializer = GetContentSerializer(contents, many=True, context={"include_text_content": with_text})
     return Response(serializer.data)
 
 
@@ -512,14 +629,53 @@ def get_content_of_topic(request, topic_id):
 @swagger_auto_schema(
     method="get",
     responses={200: TopicWithContentSerializer(many=True)},
-    operation_description="Get all topics with their content for a chapter"
+    operation_description=(
+        "Get all topics with their active content for a chapter. For a student, is_completed is the "
+        "student's own progress and topics carry their completion_percentage. Content bodies "
+        "are returned as text_digest and text_length; ?expand=text_content includes the text itself."
+    ),
+    manual_parameters=[
+        openapi.Parameter('expand', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="text_content to include content bodies"),
+        openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Same as expand"),
+    ]
 )
 @api_view(["GET"])
 @permission_classes([])
+@cache_policy('public', vary=['Authorization'])
 def get_topics_with_content_for_chapter(request, chapter_id):
     try:
-        topics = Topic.objects.filter(chapter_id=chapter_id)
+        with_text = include_text_content(request)
+        topics = chapter_topics_with_contents(chapter_id, with_text)
     except Chapter.DoesNotExist:
         return Response({"error": "Chapter not found"}, status=status.HTTP_404_NOT_FOUND)
-    serializer = TopicWithContentSerializer(topics, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    data = TopicWithContentSerializer(topics, many=True, context={"include_text_content": with_text}).data
+
+    student_id = requesting_student_id(request)
+    if student_id is not None:
+        return apply_cache_policy(Response(with_student_progress(data, student_id)), 'private')
+    return Response(data)
+
+
+
+# 5. Get the whole course tree of a subject
+@swagger_auto_schema(
+    method="get",
+    operation_description=(
+        "Get a subject with all its chapters, their topics and the active contents of each topic "
+        "in one response, instead of one request per chapter and per topic. For a student, "
+        "is_completed is the student's own progress and topics carry their completion_percentage."
+    ),
+    responses={200: "Subject tree", 404: "Subject not found"}
+)
+@api_view(["GET"])
+@permission_classes([])
+@cache_policy('public', vary=['Authorization'])
+def get_subject_tree_view(request, subject_id):
+    tree = get_subject_tree(subject_id)
+    if tree is None:
+        return Response({"error": "Subject not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    student_id = requesting_student_id(request)
+    if student_id is not None:
+        return apply_cache_policy(Response(subject_tree_for_student(tree, student_id)), 'private')
+    return Response(tree)
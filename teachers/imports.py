@@ -0,0 +1,97 @@
+from django.db import transaction
+
+from teachers.models import TeacherProfile
+from teachers.serializers import TeacherImportRowSerializer
+from users.models import CustomUser
+from users.utils import DEFAULT_PASSWORD, email_conflicts, hash_passwords, serializer_errors
+from v1.models import ClassModel
+
+
+def rows_from_json(items):
+    """Number the objects of a JSON array like CSV rows (1-based, no header)."""
+    return [(index, item if isinstance(item, dict) else {}) for index, item in enumerate(items, start=1)]
+
+
+def split_class_ids(rows):
+    """CSV rows give assigned_class_ids as one cell such as "3;4" or "3 4"; turn it into a list."""
+    for _, row in rows:
+        value = row.get('assigned_class_ids')
+        if isinstance(value, str):
+            row['assigned_class_ids'] = value.replace(';', ' ').replace(',', ' ').split()
+    return rows
+
+
+def validate_teacher_rows(rows, school):
+    """
+    Validate every row before anything is written.
+
+    Emails are checked against the file and the database, and every referenced class
+    id is resolved against the school's classes, with one query each. Returns
+    (valid_rows, errors) where errors is a list of {"row": number, "errors": {...}}.
+    """
+    checked = []
+    for line, row in rows:
+        serializer = TeacherImportRowSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data['email'] = CustomUser.objects.normalize_email(data['email'])
+            checked.append((line, data, {}))
+        else:
+            checked.append((line, None, serializer_errors(serializer)))
+
+    conflicts = iter(email_conflicts([data['email'] for _, data, _ in checked if data]))
+    class_ids = {class_id for _, data, _ in checked if data for class_id in data.get('assigned_class_ids', [])}
+    school_classes = set(ClassModel.objects.filter(school=school, id__in=class_ids).values_list('id', flat=True))
+
+    valid, errors = [], []
+    for line, data, row_errors in checked:
+        if data:
+            conflict = next(conflicts)
+            if conflict:
+                row_errors['email'] = [conflict]
+            unknown = sorted(set(data.get('assigned_class_ids', [])) - school_classes)
+            if unknown:
+                row_errors['assigned_class_ids'] = [f"No class with id {class_id} in the school." for class_id in unknown]
+
+        if row_errors:
+            errors.append({"row": line, "errors": row_errors})
+        else:
+            valid.append(data)
+    return valid, errors
+
+
+def import_teachers(school, rows, chunk_size=500, skip_invalid=False, workers=None):
+    """
+    Create users, teacher profiles and their assigned classes for parsed rows.
+
+    Nothing is written when a row is invalid, unless skip_invalid is set. Each chunk
+    is one transaction with three bulk inserts: users, profiles and the
+    assigned_classes through-rows. Returns (created_count, errors).
+    """
+    valid, errors = validate_teacher_rows(rows, school)
+    if errors and not skip_invalid:
+        return 0, errors
+
+    password_hashes = hash_passwords([DEFAULT_PASSWORD] * len(valid), workers=workers)
+    AssignedClass = TeacherProfile.assigned_classes.through
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create([
+                CustomUser(email=data['email'], full_name=data['full_name'], role='teacher', password=password_hash)
+                for data, password_hash in zip(chunk, password_hashes[start:start + chunk_size])
+            ])
+            teachers = TeacherProfile.objects.bulk_create([
+                TeacherProfile(
+                    user=user, school=school,
+                    **{key: value for key, value in data.items() if key not in ('email', 'full_name', 'assigned_class_ids')}
+                )
+                for user, data in zip(users, chunk)
+            ])
+            AssignedClass.objects.bulk_create([
+                AssignedClass(teacherprofile_id=teacher.id, classmodel_id=class_id)
+                for teacher, data in zip(teachers, chunk)
+                for class_id in set(data.get('assigned_class_ids', []))
+            ])
+    return len(valid), errors
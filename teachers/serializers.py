@@ -41,6 +41,24 @@ class TeacherCreateSerializer(serializers.ModelSerializer):
 
 
 
+class TeacherImportRowSerializer(serializers.ModelSerializer):
+    """One row of a bulk teacher import (see teachers.imports)."""
+    full_name = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
+    assigned_class_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = TeacherProfile
+        fields = [
+            'full_name', 'email',
+            'subject_specialization', 'phone_number', 'qualification',
+            'date_of_birth', 'gender', 'address',
+            'experience_years', 'assigned_class_ids'
+        ]
+
+
+
+
 
 
 class StudentListSerializer(serializers.ModelSerializer):
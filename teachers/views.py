@@ -1,16 +1,21 @@
+import csv
+import json
+
 from rest_framework.decorators import api_view, permission_classes,parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from .serializers import TeacherCreateSerializer, StudentListSerializer, TeacherNoteSerializer, TeacherListSerializer
 from v1.models import TeacherSubjectAssignment,Content, Topic
 from students.models import StudentClassAssignment
 from users.models import CustomUser
 from school.models import SchoolProfile 
 from .models import TeacherProfile
+from .imports import import_teachers, rows_from_json, split_class_ids
+from users.utils import read_csv_rows
 
 
 
@@ -53,6 +58,59 @@ def create_teacher(request, school_user_id):
 
 
 
+@swagger_auto_schema(
+    method='post',
+    operation_description=(
+        "Create many teachers at once. Send either a JSON array of teacher objects (same fields as "
+        "create-teacher, without profile_picture) or a multipart 'file' holding a CSV or a .json array. "
+        "In CSV, assigned_class_ids is one cell such as \"3;4\"."
+    ),
+    manual_parameters=[
+        openapi.Parameter('school_user_id', openapi.IN_PATH, type=openapi.TYPE_INTEGER, required=True,
+                          description='User ID of the school owner'),
+        openapi.Parameter('skip_invalid', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                          description="Import the valid rows even when some rows have errors"),
+    ],
+    responses={201: "Teachers imported", 400: "Per-row validation errors", 404: "School not found"}
+)
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@parser_classes([JSONParser, MultiPartParser, FormParser])
+def bulk_import_teachers(request, school_user_id):
+    try:
+        school_user = CustomUser.objects.get(id=school_user_id, role='school')
+        school = school_user.school_profile
+    except CustomUser.DoesNotExist:
+        return Response({"error": "School user not found."}, status=status.HTTP_404_NOT_FOUND)
+    except SchoolProfile.DoesNotExist:
+        return Response({"error": "School profile not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    upload = request.FILES.get('file')
+    try:
+        if upload is not None and not upload.name.lower().endswith('.json'):
+            rows = split_class_ids(read_csv_rows(upload))
+        else:
+            items = json.load(upload) if upload is not None else request.data
+            if not isinstance(items, list):
+                return Response({"error": "Send a JSON array of teachers or upload a CSV / JSON file as 'file'."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            rows = rows_from_json(items)
+    except (UnicodeDecodeError, ValueError, csv.Error) as exc:
+        return Response({"error": f"Could not read the upload: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    skip_invalid = str(request.query_params.get('skip_invalid', '')).lower() in ('1', 'true', 'yes')
+    created, errors = import_teachers(school, rows, skip_invalid=skip_invalid)
+
+    if errors and not skip_invalid:
+        return Response({"status": False, "created": 0, "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"status": True, "created": created, "errors": errors}, status=status.HTTP_201_CREATED)
+
+
+
+
+
+
+
 
 
 
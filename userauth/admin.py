@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import AuthToken
 
-# Register your models here.
+
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('key', 'user', 'created', 'expires_at')
+    search_fields = ('user__email',)
+    raw_id_fields = ('user',)
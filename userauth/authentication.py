@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from users.models import CustomUser
+from userauth.models import AuthToken
+from userauth.tokens import renew_token
+
+
+TOKEN_CACHE_KEY = 'auth:token:{key}'
+
+# In model field order, as Model.from_db expects
+USER_FIELDS = [
+    field.attname for field in CustomUser._meta.concrete_fields
+    if field.attname in ('id', 'email', 'full_name', 'role', 'is_active', 'is_staff', 'is_superuser')
+]
+
+# snapshot key -> lookup, all fetched in one query from the token row
+SNAPSHOT_LOOKUPS = {
+    'token_created': 'created',
+    'token_expires_at': 'expires_at',
+    **{field: f'user__{field}' for field in USER_FIELDS},
+    'school_profile_id': 'user__school_profile__id',
+    'teacher_profile_id': 'user__teacher_profile__id',
+    'student_profile_id': 'user__student_profile__id',
+    'teacher_school_id': 'user__teacher_profile__school_id',
+    'student_school_id': 'user__student_profile__school_id',
+}
+
+_snapshots = OrderedDict()  # token key -> (expires_at, snapshot), most recently used last
+_snapshots_lock = threading.Lock()
+
+
+def load_token_snapshot(key):
+    """Read everything authentication needs about a token in one query, or None."""
+    return AuthToken.objects.filter(key=key).values(**{name: F(lookup) for name, lookup in SNAPSHOT_LOOKUPS.items()}).first()
+
+
+def get_token_snapshot(key):
+    """
+    Return the snapshot of a token from the shared cache or the database.
+
+    Revocations drop the shared cache entry, so every process sees them on its next
+    request. The process-local LRU in front of it is opt-in (AUTH_TOKEN_LOCAL_TTL > 0):
+    with it, another process may keep accepting a revoked token for that many seconds.
+    """
+    now = time.monotonic()
+    if settings.AUTH_TOKEN_LOCAL_TTL > 0:
+        with _snapshots_lock:
+            entry = _snapshots.get(key)
+            if entry is not None and entry[0] > now:
+                _snapshots.move_to_end(key)
+                return entry[1]
+
+    cache_key = TOKEN_CACHE_KEY.format(key=key)
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = load_token_snapshot(key)
+        if snapshot is None:
+            return None
+        cache.set(cache_key, snapshot, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+    _remember(key, snapshot, now)
+    return snapshot
+
+
+def _remember(key, snapshot, now):
+    if settings.AUTH_TOKEN_LOCAL_TTL <= 0:
+        return
+    with _snapshots_lock:
+        _snapshots[key] = (now + settings.AUTH_TOKEN_LOCAL_TTL, snapshot)
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > settings.AUTH_TOKEN_LRU_SIZE:
+            _snapshots.popitem(last=False)
+
+
+def update_token_snapshot(key, snapshot):
+    """Replace a token's snapshot in the shared cache and the local LRU, e.g. after renewing it."""
+    cache.set(TOKEN_CACHE_KEY.format(key=key), snapshot, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+    _remember(key, snapshot, time.monotonic())
+
+
+def invalidate_token(key):
+    cache.delete(TOKEN_CACHE_KEY.format(key=key))
+    with _snapshots_lock:
+        _snapshots.pop(key, None)
+
+
+def invalidate_user_tokens(user_id):
+    for key in AuthToken.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+def user_from_snapshot(snapshot):
+    """
+    Build the request user from a snapshot without a query.
+
+    The instance is loaded through from_db with only the snapshot fields, so any other
+    field is fetched on first access and save() only writes the loaded fields.
+    """
+    user = CustomUser.from_db('default', USER_FIELDS, [snapshot[field] for field in USER_FIELDS])
+    user.auth_snapshot = snapshot
+    return user
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication over AuthToken that serves token -> user lookups from a snapshot cache.
+
+    request.user carries the snapshot as `auth_snapshot` (profile and school ids included).
+    Snapshots are dropped by the userauth signals, once the transaction commits, when a
+    token is deleted (logout, refresh) or its user is saved (e.g. deactivated).
+
+    Expired tokens are rejected from the snapshot's expiry; tokens in use are renewed
+    by renew_token once less than half of their lifetime is left.
+    """
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        snapshot = get_token_snapshot(key)
+        if snapshot is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not snapshot['is_active']:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        if snapshot['token_expires_at'] <= timezone.now():
+            invalidate_token(key)
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+
+        renewed = renew_token(key, snapshot['token_expires_at'])
+        if renewed:
+            snapshot = {**snapshot, 'token_expires_at': renewed}
+            update_token_snapshot(key, snapshot)
+
+        user = user_from_snapshot(snapshot)
+        token = AuthToken.from_db(
+            'default', ['key', 'user_id', 'created', 'expires_at'],
+            [key, user.id, snapshot['token_created'], snapshot['token_expires_at']],
+        )
+        token.user = user
+        return user, token
@@ -0,0 +1,62 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from users.models import CustomUser
+from userauth.utils import check_user_password, get_login_pool, login_hash_workers
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a burst of logins against the password check of the login pipeline and report "
+        "throughput (logins/s, overall and per core) and latency, inline and through the login pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200, help="Logins per run")
+        parser.add_argument('--concurrency', type=int, help="Simultaneous logins (default: twice the pool size)")
+        parser.add_argument('--mode', choices=['inline', 'pool', 'both'], default='both')
+
+    def handle(self, *args, **options):
+        workers = login_hash_workers() or os.cpu_count() or 1
+        concurrency = options['concurrency'] or workers * 2
+        password = 'benchmark-password'
+        # Unsaved user hashed with the current profile, so no rehash is triggered
+        user = CustomUser(email='benchmark@example.com', role='student', password=make_password(password))
+
+        self.stdout.write(
+            f"Hasher: {settings.PASSWORD_HASHERS[0]} (profile {getattr(settings, 'PASSWORD_HASHER_PROFILE', '-')}), "
+            f"{options['logins']} logins, concurrency {concurrency}, {os.cpu_count()} CPU(s)"
+        )
+
+        if options['mode'] in ('inline', 'both'):
+            with override_settings(LOGIN_HASH_WORKERS=0):
+                self.run('inline', user, password, options['logins'], concurrency, os.cpu_count() or 1)
+        if options['mode'] in ('pool', 'both'):
+            with override_settings(LOGIN_HASH_WORKERS=workers):
+                get_login_pool().submit(int).result()  # start the workers outside the timed run
+                self.run(f'pool x{workers}', user, password, options['logins'], concurrency, workers)
+
+    def run(self, label, user, password, logins, concurrency, cores):
+        def login(_):
+            started = time.perf_counter()
+            assert check_user_password(user, password)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as threads:
+            latencies = sorted(threads.map(login, range(logins)))
+        elapsed = time.perf_counter() - started
+
+        throughput = logins / elapsed
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{label:>10}: {throughput:8.1f} logins/s, {throughput / cores:7.1f} per core, "
+            f"p50 {statistics.median(latencies) * 1000:7.1f} ms, p99 {p99 * 1000:7.1f} ms"
+        )
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from userauth.tokens import sweep_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired API tokens in small batches, one short statement each. "
+        "With --interval the sweep repeats forever, for running as a background process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.05, help="Pause between batches so other writers get the lock")
+        parser.add_argument('--interval', type=float, default=None, help="Sweep again every N seconds instead of exiting")
+
+    def handle(self, *args, **options):
+        while True:
+            total = 0
+            while True:
+                removed = sweep_expired_tokens(options['batch_size'])
+                if not removed:
+                    break
+                total += removed
+                time.sleep(options['sleep'])
+            self.stdout.write(self.style.SUCCESS(f"Deleted {total} expired token(s)."))
+
+            if options['interval'] is None:
+                break
+            time.sleep(options['interval'])
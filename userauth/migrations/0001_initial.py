@@ -0,0 +1,45 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import timedelta
+from django.utils import timezone
+
+
+def copy_authtoken_tokens(apps, schema_editor):
+    # Existing tokens keep working, with a full lifetime from now
+    Token = apps.get_model('authtoken', 'Token')
+    AuthToken = apps.get_model('userauth', 'AuthToken')
+    expires_at = timezone.now() + timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', 7 * 24 * 60 * 60))
+    AuthToken.objects.bulk_create(
+        [AuthToken(key=token.key, user_id=token.user_id, expires_at=expires_at)
+         for token in Token.objects.all().iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('authtoken', '0003_tokenproxy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'created'], name='userauth_au_user_id_500ab6_idx')],
+            },
+        ),
+        migrations.RunPython(copy_authtoken_tokens, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,28 @@
+import binascii
+import os
+
 from django.db import models
+from users.models import CustomUser
+
+
+class AuthToken(models.Model):
+    """
+    API token with an expiry that slides forward while the token is in use.
+
+    A user may hold several tokens (one per device), up to AUTH_TOKEN_MAX_PER_USER;
+    expired rows are purged by the sweep_auth_tokens command.
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='auth_tokens')
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'created'])]
+
+    @staticmethod
+    def generate_key():
+        return binascii.hexlify(os.urandom(20)).decode()
 
-# Create your models here.
+    def __str__(self):
+        return f"Token of {self.user_id} expiring {self.expires_at:%Y-%m-%d %H:%M}"
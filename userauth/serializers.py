@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from users.models import CustomUser
+from userauth.utils import PROFILE_RELATIONS, check_user_password
 
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -12,11 +13,15 @@ class LoginSerializer(serializers.Serializer):
         role = data.get("role")
 
         try:
-            user = CustomUser.objects.get(email=email, role=role)
+            # The role's profile comes in the same query (see login_profile_payload)
+            users = CustomUser.objects.all()
+            if role in PROFILE_RELATIONS:
+                users = users.select_related(PROFILE_RELATIONS[role])
+            user = users.get(email=email, role=role)
         except CustomUser.DoesNotExist:
             raise serializers.ValidationError("Invalid email or role")
 
-        if not user.check_password(password):
+        if not check_user_password(user, password):
             raise serializers.ValidationError("Incorrect password")
 
         if not user.is_active:
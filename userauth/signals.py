@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from school.models import SchoolProfile
+from students.models import StudentProfile
+from teachers.models import TeacherProfile
+from users.models import CustomUser
+from userauth.models import AuthToken
+from userauth.authentication import invalidate_token, invalidate_user_tokens
+from userauth.utils import invalidate_login_profile
+
+
+def invalidate_user_on_commit(user_id):
+    # After commit, so a request running meanwhile cannot cache the old state again
+    def invalidate():
+        invalidate_user_tokens(user_id)
+        invalidate_login_profile(user_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=AuthToken)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    # Covers logout, refresh and tokens dropped by the per-user limit or the sweeper
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_token(key))
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_tokens_on_user_change(sender, instance, created, **kwargs):
+    # e.g. is_active switched off or role changed
+    if not created:
+        invalidate_user_on_commit(instance.id)
+
+
+@receiver([post_save, post_delete], sender=SchoolProfile)
+@receiver([post_save, post_delete], sender=TeacherProfile)
+@receiver([post_save, post_delete], sender=StudentProfile)
+def invalidate_tokens_on_profile_change(sender, instance, **kwargs):
+    # Snapshots hold the profile and school ids, the login payload the whole profile
+    invalidate_user_on_commit(instance.user_id)
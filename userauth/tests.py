@@ -1,3 +1,79 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from userauth.models import AuthToken
+from userauth.tokens import issue_token, sweep_expired_tokens, token_ttl
+from users.models import CustomUser
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, AUTH_TOKEN_MAX_PER_USER=2)
+class AuthTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(email='u@example.com', password='p', full_name='U', role='student')
+        self.client = APIClient()
+
+    def use(self, key):
+        # Any authenticated view; an unknown subject answers 404 once the token is accepted
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        return self.client.get('/api/v1/students/subjects/0/tree/').status_code
+
+    def test_oldest_token_is_dropped_past_the_limit(self):
+        first, second, third = (issue_token(self.user) for _ in range(3))
+        self.assertEqual(
+            set(AuthToken.objects.filter(user=self.user).values_list('key', flat=True)), {second.key, third.key}
+        )
+
+    def test_refresh_rotates_the_token(self):
+        token = issue_token(self.user)
+        self.assertEqual(self.use(token.key), 404)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/auth/refresh-token/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['token'], token.key)
+
+        self.assertEqual(self.use(token.key), 401)
+        self.assertEqual(self.use(response.json()['token']), 404)
+
+    def test_expired_token_is_rejected(self):
+        token = issue_token(self.user)
+        AuthToken.objects.filter(key=token.key).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = self.client.get('/api/v1/students/subjects/0/tree/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['detail'], 'Token has expired.')
+
+    def test_token_in_use_is_renewed_past_half_its_lifetime(self):
+        token = issue_token(self.user)
+        self.use(token.key)
+        self.assertEqual(AuthToken.objects.get(key=token.key).expires_at, token.expires_at)
+
+        soon = timezone.now() + token_ttl() / 4
+        AuthToken.objects.filter(key=token.key).update(expires_at=soon)
+        cache.clear()
+        self.assertEqual(self.use(token.key), 404)
+        self.assertGreater(AuthToken.objects.get(key=token.key).expires_at, soon)
+
+    def test_deactivated_user_is_rejected(self):
+        token = issue_token(self.user)
+        self.assertEqual(self.use(token.key), 404)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(self.use(token.key), 401)
+
+    def test_sweep_deletes_only_expired_tokens(self):
+        expired, live = issue_token(self.user), issue_token(self.user)
+        AuthToken.objects.filter(key=expired.key).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(sweep_expired_tokens(batch_size=10), 1)
+        self.assertEqual(list(AuthToken.objects.values_list('key', flat=True)), [live.key])
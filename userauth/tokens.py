@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from userauth.models import AuthToken
+
+
+def token_ttl():
+    return timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', 7 * 24 * 60 * 60))
+
+
+def issue_token(user):
+    """
+    Create a new token for a user.
+
+    A user keeps at most AUTH_TOKEN_MAX_PER_USER tokens; the oldest ones are deleted
+    to make room, so logging in from yet another device signs out the least recent one.
+    """
+    limit = getattr(settings, 'AUTH_TOKEN_MAX_PER_USER', 5)
+    with transaction.atomic():
+        stale = list(
+            AuthToken.objects.filter(user=user).order_by('-created').values_list('key', flat=True)[max(limit - 1, 0):]
+        )
+        if stale:
+            AuthToken.objects.filter(key__in=stale).delete()
+        return AuthToken.objects.create(key=AuthToken.generate_key(), user=user, expires_at=timezone.now() + token_ttl())
+
+
+def rotate_token(token):
+    """Replace a token with a new one of the same user."""
+    with transaction.atomic():
+        AuthToken.objects.filter(key=token.key).delete()
+        return AuthToken.objects.create(key=AuthToken.generate_key(), user_id=token.user_id, expires_at=timezone.now() + token_ttl())
+
+
+def renew_token(key, expires_at):
+    """
+    Slide a token's expiry forward when less than half of AUTH_TOKEN_TTL is left.
+
+    Returns the new expiry, or None when the token did not need renewing, so
+    an active token costs at most one UPDATE per half lifetime.
+    """
+    now = timezone.now()
+    ttl = token_ttl()
+    if expires_at - now > ttl / 2:
+        return None
+    new_expiry = now + ttl
+    AuthToken.objects.filter(key=key).update(expires_at=new_expiry)
+    return new_expiry
+
+
+def sweep_expired_tokens(batch_size):
+    """Delete up to batch_size expired tokens; returns how many were deleted."""
+    keys = list(
+        AuthToken.objects.filter(expires_at__lte=timezone.now()).order_by('expires_at')
+        .values_list('key', flat=True)[:batch_size]
+    )
+    if not keys:
+        return 0
+    return AuthToken.objects.filter(key__in=keys).delete()[0]
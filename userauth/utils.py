@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+
+
+
+class LoginBusy(APIException):
+    status_code = 503
+    default_detail = "Too many logins at the same time, please try again in a moment."
+    default_code = 'login_busy'
+
+
+def verify_password(raw_password, encoded):
+    """
+    Check a password against its stored hash; runs inside a pool worker.
+
+    Returns (is_correct, upgraded_hash). upgraded_hash is set when the password is
+    correct but was hashed with another hasher or other costs than the current profile.
+    """
+    upgraded = []
+    is_correct = check_password(raw_password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return is_correct, upgraded[0] if upgraded else None
+
+
+def login_hash_workers():
+    workers = getattr(settings, 'LOGIN_HASH_WORKERS', None)
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+_pool = None
+_pending = None
+_pool_lock = threading.Lock()
+
+
+def get_login_pool():
+    """The process pool shared by all login requests of this process, created on first use."""
+    global _pool, _pending
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pending = threading.BoundedSemaphore(getattr(settings, 'LOGIN_HASH_MAX_PENDING', 64))
+                # "spawn": forking a threaded server process can copy locks held by other threads
+                _pool = ProcessPoolExecutor(
+                    max_workers=login_hash_workers(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=django.setup,
+                )
+    return _pool
+
+
+def _reset_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+def check_user_password(user, raw_password):
+    """
+    Verify a login password off the request thread, in the bounded login pool.
+
+    Raises LoginBusy when the pool already has LOGIN_HASH_MAX_PENDING checks queued
+    for longer than LOGIN_HASH_QUEUE_TIMEOUT. Like user.check_password, a correct
+    password stored with an outdated hasher is rehashed and saved.
+    """
+    if login_hash_workers() == 0:
+        return user.check_password(raw_password)
+
+    pool = get_login_pool()
+    if not _pending.acquire(timeout=getattr(settings, 'LOGIN_HASH_QUEUE_TIMEOUT', 5.0)):
+        raise LoginBusy()
+    try:
+        is_correct, upgraded = pool.submit(verify_password, raw_password, user.password).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        _reset_pool(pool)
+        is_correct, upgraded = verify_password(raw_password, user.password)
+    finally:
+        _pending.release()
+
+    if upgraded:
+        user.password = upgraded
+        user.save(update_fields=['password'])
+    return is_correct
+
+
+# role -> CustomUser relation holding that role's profile
+PROFILE_RELATIONS = {
+    'school': 'school_profile',
+    'teacher': 'teacher_profile',
+    'student': 'student_profile',
+}
+
+LOGIN_PROFILE_CACHE_KEY = 'login:profile:{user_id}'
+
+
+def serialize_login_profile(user):
+    """The "profile" part of the login response, from the profile loaded alongside the user."""
+    relation = PROFILE_RELATIONS.get(user.role)
+    profile = getattr(user, relation, None) if relation else None
+    if profile is None:
+        return None
+
+    if user.role == 'school':
+        return {
+            "id": profile.id,
+            "name": profile.name,
+            "phone_number": profile.phone_number,
+            "registration_number": profile.registration_number,
+            "address": profile.address,
+            "board_affiliation": profile.board_affiliation,
+            "principal_name": profile.principal_name,
+            "established_year": profile.established_year,
+            "website": profile.website,
+            "logo": profile.logo.url if profile.logo else None
+        }
+
+    if user.role == 'teacher':
+        return {
+            "id": profile.id,
+            "school_id": profile.school_id,
+            "subject_specialization": profile.subject_specialization,
+            "phone_number": profile.phone_number,
+            "qualification": profile.qualification,
+            "date_of_birth": profile.date_of_birth,
+            "gender": profile.gender,
+            "address": profile.address,
+            "experience_years": profile.experience_years,
+            "profile_picture": profile.profile_picture.url if profile.profile_picture else None
+        }
+
+    return {
+        "id": profile.id,
+        "school_id": profile.school_id,
+        "roll_number": profile.roll_number,
+        "guardian_name": profile.guardian_name,
+        "contact_number": profile.contact_number,
+        "date_of_birth": profile.date_of_birth,
+        "gender": profile.gender,
+        "address": profile.address,
+        "admission_date": profile.admission_date,
+        "profile_picture": profile.profile_picture.url if profile.profile_picture else None
+    }
+
+
+def login_profile_payload(user):
+    """Serialized login profile of a user, cached until the profile changes (see userauth.signals)."""
+    key = LOGIN_PROFILE_CACHE_KEY.format(user_id=user.id)
+    payload = cache.get(key)
+    if payload is None:
+        payload = {"profile": serialize_login_profile(user)}
+        cache.set(key, payload, getattr(settings, 'LOGIN_PROFILE_CACHE_TIMEOUT', 60 * 60))
+    return payload["profile"]
+
+
+def invalidate_login_profile(user_id):
+    cache.delete(LOGIN_PROFILE_CACHE_KEY.format(user_id=user_id))
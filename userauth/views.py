@@ -4,12 +4,14 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from lms.caching import cache_policy
 from .serializers import LoginSerializer
+from .tokens import issue_token, rotate_token
+from .utils import login_profile_payload
 from users.models import CustomUser
 from school.models import SchoolProfile
 from students.models import StudentProfile
@@ -33,63 +35,18 @@ from teachers.models import TeacherProfile
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@cache_policy('no-store')
 def login_view(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        token, _ = Token.objects.get_or_create(user=user)
-
-        profile_data = None
-
-        if user.role == 'school' and hasattr(user, 'school_profile'):
-            profile = user.school_profile
-            profile_data = {
-                "id": profile.id,
-                "name": profile.name,
-                "phone_number": profile.phone_number,
-                "registration_number": profile.registration_number,
-                "address": profile.address,
-                "board_affiliation": profile.board_affiliation,
-                "principal_name": profile.principal_name,
-                "established_year": profile.established_year,
-                "website": profile.website,
-                "logo": profile.logo.url if profile.logo else None
-            }
-
-        elif user.role == 'teacher' and hasattr(user, 'teacher_profile'):
-            profile = user.teacher_profile
-            profile_data = {
-                "id": profile.id,
-                "school_id": profile.school.id,
-                "subject_specialization": profile.subject_specialization,
-                "phone_number": profile.phone_number,
-                "qualification": profile.qualification,
-                "date_of_birth": profile.date_of_birth,
-                "gender": profile.gender,
-                "address": profile.address,
-                "experience_years": profile.experience_years,
-                "profile_picture": profile.profile_picture.url if profile.profile_picture else None
-            }
-
-        elif user.role == 'student':
-            profile = getattr(user, 'student_profile', None)
-            if profile:
-                profile_data = {
-                    "id": profile.id,
-                    "school_id": profile.school.id if profile.school else None,
-                    "roll_number": profile.roll_number,
-                    "guardian_name": profile.guardian_name,
-                    "contact_number": profile.contact_number,
-                    "date_of_birth": profile.date_of_birth,
-                    "gender": profile.gender,
-                    "address": profile.address,
-                    "admission_date": profile.admission_date,
-                    "profile_picture": profile.profile_picture.url if profile.profile_picture else None
-                }
+        token = issue_token(user)
 
+        profile_data = login_profile_payload(user)
 
         return Response({
             "token": token.key,
+            "expires_at": token.expires_at,
             "user": {
                 "id": user.id,
                 "email": user.email,
@@ -153,13 +110,13 @@ def logout_view(request):
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@cache_policy('no-store')
 def refresh_token_view(request):
     user = request.user
     if not user or not request.auth:
         return Response({"error": "Unauthorized"}, status=401)
 
-    request.auth.delete()  # delete old token
-    token = Token.objects.create(user=user)
-    return Response({"token": token.key}, status=200)
+    token = rotate_token(request.auth)
+    return Response({"token": token.key, "expires_at": token.expires_at}, status=200)
 
 
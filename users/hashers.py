@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count of settings.PASSWORD_HASHER_PARAMS['pbkdf2']."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get('pbkdf2', {}).get(
+            'iterations', PBKDF2PasswordHasher.iterations
+        )
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the costs of settings.PASSWORD_HASHER_PARAMS['argon2'] (needs argon2-cffi).
+
+    Hashes made with other costs still verify and are upgraded on the next login.
+    """
+
+    def _param(self, name):
+        return getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get('argon2', {}).get(
+            name, getattr(Argon2PasswordHasher, name)
+        )
+
+    @property
+    def time_cost(self):
+        return self._param('time_cost')
+
+    @property
+    def memory_cost(self):
+        return self._param('memory_cost')
+
+    @property
+    def parallelism(self):
+        return self._param('parallelism')
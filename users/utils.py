@@ -0,0 +1,99 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from users.models import CustomUser
+
+
+DEFAULT_PASSWORD = 'demo@123'  # initial credential given to every account a school creates
+
+# Below this many passwords, starting worker processes costs more than it saves
+PARALLEL_HASHING_THRESHOLD = 16
+
+
+def read_csv_rows(file):
+    """
+    Parse an uploaded CSV (bytes or text file) into a list of (line_number, row dict).
+
+    Header names are lower-cased, values stripped and empty cells dropped, so
+    optional columns can be left blank.
+    """
+    content = file.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    rows = []
+    for row in csv.DictReader(io.StringIO(content)):
+        cleaned = {
+            key.strip().lower(): value.strip()
+            for key, value in row.items()
+            if key and value and value.strip()
+        }
+        if 'gender' in cleaned:
+            cleaned['gender'] = cleaned['gender'].lower()
+        rows.append((len(rows) + 2, cleaned))  # line 1 is the header
+    return rows
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash passwords with the configured hasher, spread over a pool of processes.
+
+    Every hash gets its own salt, so even a shared default password costs one full
+    key derivation per user; running them on all cores divides the wall time.
+    """
+    workers = workers or getattr(settings, 'BULK_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < PARALLEL_HASHING_THRESHOLD:
+        return [make_password(password) for password in passwords]
+
+    # django.setup loads the settings in workers started with "spawn" (macOS / Windows)
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _error_messages(errors, prefix=''):
+    """Yield the messages of a (possibly nested) DRF error structure, prefixed with their index or key."""
+    if isinstance(errors, dict):
+        for key, nested in errors.items():
+            yield from _error_messages(nested, f"{prefix}{key}: ")
+    elif isinstance(errors, (list, tuple)):
+        for index, item in enumerate(errors):
+            # Nested many=True serializers report one (possibly empty) dict per item
+            yield from _error_messages(item, f"{prefix}{index}: " if isinstance(item, dict) else prefix)
+    else:
+        yield f"{prefix}{errors}"
+
+
+def serializer_errors(serializer):
+    """
+    Flatten a row serializer's errors into plain {field: [message, ...]}.
+
+    Errors of nested fields keep their index or key, e.g. a ListField child error
+    becomes "0: A valid integer is required.".
+    """
+    return {field: list(_error_messages(messages)) for field, messages in serializer.errors.items()}
+
+
+def email_conflicts(emails):
+    """
+    Check the emails of a bulk import in one query.
+
+    Returns a list parallel to `emails` holding an error message for emails that are
+    already registered or repeated earlier in the list, and None for the others.
+    """
+    taken = set(CustomUser.objects.filter(email__in=emails).values_list('email', flat=True))
+    conflicts, seen = [], set()
+    for email in emails:
+        if email in taken:
+            conflicts.append("A user with this email already exists.")
+        elif email in seen:
+            conflicts.append("This email appears more than once in the file.")
+        else:
+            conflicts.append(None)
+        seen.add(email)
+    return conflicts
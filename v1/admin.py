@@ -1,6 +1,25 @@
 # v1/admin.py
+from django import forms
 from django.contrib import admin
-from .models import ClassModel, Subject, TeacherSubjectAssignment, Chapter, Topic, Content
+from .models import ClassModel, Subject, TeacherSubjectAssignment, Chapter, Topic, Content, ContentBody
+
+
+class ContentAdminForm(forms.ModelForm):
+    # Edits the text; saving points the content at the matching ContentBody
+    text_content = forms.CharField(widget=forms.Textarea, required=False)
+
+    class Meta:
+        model = Content
+        exclude = ("body", "text_length")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault("text_content", self.instance.text_content)
+
+    def save(self, commit=True):
+        self.instance.text_content = self.cleaned_data.get("text_content")
+        return super().save(commit)
 
 
 class ContentInline(admin.TabularInline):
@@ -68,7 +87,16 @@ class TopicAdmin(admin.ModelAdmin):
 
 @admin.register(Content)
 class ContentAdmin(admin.ModelAdmin):
-    list_display = ("title", "topic", "order", "is_active", "is_completed", "created_at")
+    form = ContentAdminForm
+    list_display = ("title", "topic", "order", "is_active", "is_completed", "text_length", "created_at")
+    list_select_related = ("topic",)
     list_filter = ("is_active", "is_completed", "topic")
     search_fields = ("title", "topic__title")
     ordering = ("topic", "order")
+
+
+@admin.register(ContentBody)
+class ContentBodyAdmin(admin.ModelAdmin):
+    list_display = ("digest", "length", "created_at")
+    search_fields = ("digest",)
+    readonly_fields = ("digest", "text", "length", "created_at")
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework.renderers import JSONRenderer
+
+from lms import middleware
+
+try:
+    from lms.renderers import ORJSONRenderer
+except ImportError:
+    ORJSONRenderer = None
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare API responses before and after the response optimizations: JSON render time with "
+        "DRF's JSONRenderer and the orjson renderer, and bytes on the wire uncompressed, gzipped and "
+        "brotli-compressed. Runs the requests in-process against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', action='append', required=True,
+            help="API path to fetch, e.g. /api/v1/panel/dashboard/ (repeat for several)"
+        )
+        parser.add_argument('--token', help="Token sent as the Authorization header")
+        parser.add_argument('--runs', type=int, default=50, help="Renders timed per renderer")
+
+    def handle(self, *args, **options):
+        headers = {'HTTP_AUTHORIZATION': f"Token {options['token']}"} if options['token'] else {}
+        client = Client()
+        encodings = ['identity', 'gzip'] + (['br'] if middleware.brotli is not None else [])
+        renderers = [('json', JSONRenderer())] + ([('orjson', ORJSONRenderer())] if ORJSONRenderer else [])
+
+        for url in options['url']:
+            response = client.get(url, HTTP_ACCEPT_ENCODING='identity', **headers)
+            if response.status_code != 200:
+                raise CommandError(f"{url} answered {response.status_code}")
+            self.stdout.write(url)
+
+            data = getattr(response, 'data', None)
+            if data is not None:
+                for name, renderer in renderers:
+                    started = time.perf_counter()
+                    for _ in range(options['runs']):
+                        body = renderer.render(data)
+                    per_render = (time.perf_counter() - started) / options['runs']
+                    self.stdout.write(f"  render {name:>8}: {per_render * 1000:8.3f} ms, {len(body):>9} bytes")
+
+            for encoding in encodings:
+                response = client.get(url, HTTP_ACCEPT_ENCODING=encoding, **headers)
+                size = len(b''.join(response.streaming_content)) if response.streaming else len(response.content)
+                self.stdout.write(
+                    f"  wire {encoding:>10}: {size:>9} bytes "
+                    f"({response.get('Content-Encoding', 'identity')}, {response.get('Cache-Control', '-')})"
+                )
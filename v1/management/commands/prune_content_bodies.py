@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from v1.models import ContentBody
+
+
+class Command(BaseCommand):
+    help = "Delete content bodies that no content points at any more (e.g. after edits), in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.05, help="Pause between batches so other writers get the lock")
+        parser.add_argument('--grace', type=int, default=60 * 60, help="Keep bodies created less than this many seconds ago")
+
+    def handle(self, *args, **options):
+        # A body is interned before the content pointing at it is saved; the grace period
+        # and the row locks (see ContentBody.intern) keep such bodies from being pruned
+        created_before = timezone.now() - timedelta(seconds=options['grace'])
+        total = 0
+        while True:
+            with transaction.atomic():
+                digests = list(
+                    ContentBody.objects.select_for_update(skip_locked=True, of=('self',))
+                    .filter(created_at__lt=created_before, contents__isnull=True)
+                    .values_list('digest', flat=True)[:options['batch_size']]
+                )
+                if not digests:
+                    break
+                # Checked again on delete, in case a content started using one of them meanwhile
+                total += ContentBody.objects.filter(digest__in=digests, contents__isnull=True).delete()[0]
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} unused content bodies."))
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.5 on 2026-10-18 04:24
+
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def move_text_to_bodies(apps, schema_editor):
+    Content = apps.get_model('v1', 'Content')
+    ContentBody = apps.get_model('v1', 'ContentBody')
+    for content in Content.objects.exclude(text_content__isnull=True).only('id', 'text_content').iterator():
+        text = content.text_content
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        ContentBody.objects.get_or_create(digest=digest, defaults={'text': text, 'length': len(text)})
+        Content.objects.filter(id=content.id).update(body_id=digest, text_length=len(text))
+
+
+def restore_text_from_bodies(apps, schema_editor):
+    Content = apps.get_model('v1', 'Content')
+    for content in Content.objects.exclude(body__isnull=True).select_related('body').iterator():
+        Content.objects.filter(id=content.id).update(text_content=content.body.text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('v1', '0004_alter_classmodel_school'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentBody',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('text', models.TextField()),
+                ('length', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='text_length',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='body',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='contents', to='v1.contentbody'),
+        ),
+        migrations.RunPython(move_text_to_bodies, restore_text_from_bodies),
+        migrations.RemoveField(
+            model_name='content',
+            name='text_content',
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+import hashlib
+
+from django.db import models, transaction
 from school.models import SchoolProfile
 from students.models import StudentProfile
 from teachers.models import TeacherProfile
@@ -85,20 +87,85 @@ class Topic(models.Model):
 
 
 
+class ContentBody(models.Model):
+    """
+    Lesson text stored once per distinct body, keyed by its SHA-256.
+
+    Contents with the same text (e.g. a lesson shared by several schools) point at one
+    row; a body never changes, editing a content's text points it at another body.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    text = models.TextField()
+    length = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def digest_of(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def intern(cls, text):
+        """
+        The body row holding `text`, created if no content used that text before.
+
+        An existing row is locked until the caller's transaction ends, so
+        prune_content_bodies cannot delete it before the content pointing at it is saved.
+        """
+        body, _ = cls.objects.select_for_update().get_or_create(
+            digest=cls.digest_of(text), defaults={'text': text, 'length': len(text)}
+        )
+        return body
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.length} chars)"
+
+
+
+
+_UNCHANGED = object()
+
+
 class Content(models.Model):
     topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='contents')
     title = models.CharField(max_length=255)
     video_link = models.URLField(blank=True, null=True)
-    text_content = models.TextField(blank=True, null=True)
+    # Lesson text lives in ContentBody; lists return body_id (the digest) and text_length only
+    body = models.ForeignKey(ContentBody, on_delete=models.PROTECT, related_name='contents', blank=True, null=True)
+    text_length = models.PositiveIntegerField(default=0)
     order = models.PositiveIntegerField(default=1)
     is_active = models.BooleanField(default=True)
     is_completed = models.BooleanField(default=False)  # ❗ global completion
     created_at = models.DateTimeField(auto_now_add=True)
 
+    _new_text = _UNCHANGED
+
     class Meta:
         ordering = ['order']
 
     def __str__(self):
         return f"{self.title} ({self.topic.title})"
 
+    @property
+    def text_content(self):
+        if self._new_text is not _UNCHANGED:
+            return self._new_text
+        return self.body.text if self.body_id else None
+
+    @text_content.setter
+    def text_content(self, value):
+        # Stored in ContentBody on save(); Content(text_content=...) and create() work as before
+        self._new_text = value
+
+    def save(self, *args, **kwargs):
+        if self._new_text is _UNCHANGED:
+            return super().save(*args, **kwargs)
+
+        text, self._new_text = self._new_text, _UNCHANGED
+        with transaction.atomic():
+            self.body = ContentBody.intern(text) if text is not None else None
+            self.text_length = len(text) if text is not None else 0
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'body', 'text_length'} - {'text_content'}
+            super().save(*args, **kwargs)
+
 
@@ -58,9 +58,11 @@ class SubjectListSerializer(serializers.ModelSerializer):
 
 
 class ContentMiniSerializer(serializers.ModelSerializer):
+    text_digest = serializers.CharField(source='body_id', read_only=True)
+
     class Meta:
         model = Content
-        fields = ['id', 'title', 'video_link', 'text_content', 'order', 'is_active', 'is_completed']
+        fields = ['id', 'title', 'video_link', 'text_digest', 'text_length', 'order', 'is_active', 'is_completed']
 
 class TopicWithContentsSerializerV2(serializers.ModelSerializer):
     contents = ContentMiniSerializer(many=True)
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import add_topic_with_content, get_subjects_by_class, get_topics_with_contents_by_subject, get_teacher_notes_by_topic,create_chapter, get_classes_by_school
+from .views import add_topic_with_content, get_subjects_by_class, get_topics_with_contents_by_subject, get_teacher_notes_by_topic,create_chapter, get_classes_by_school, get_content_body
 
 urlpatterns = [
     path('topic/add/', add_topic_with_content, name='add-topic-content'),
@@ -8,4 +8,5 @@ urlpatterns = [
     path('topic/teacher-notes/', get_teacher_notes_by_topic, name='get-teacher-notes-by-topic'),
     path('subjects/<int:subject_id>/add-chapter/', create_chapter, name='create_chapter'),
     path('classes/<int:school_user_id>/', get_classes_by_school, name='get_classes_by_school'),
+    path('content-bodies/<str:digest>/', get_content_body, name='get-content-body'),
 ]
@@ -1,7 +1,18 @@
-from rest_framework.authtoken.models import Token
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework import status
 
+from userauth.authentication import CachedTokenAuthentication
+from v1.models import ContentBody
+
+
+CONTENT_BODY_CACHE_KEY = 'content:body:{digest}'
+DIGEST_PATTERN = re.compile(r'[0-9a-f]{64}')
+
 
 def get_user_from_token(request):
     auth_header = request.headers.get('Authorization')
@@ -10,7 +21,24 @@ def get_user_from_token(request):
     
     token_key = auth_header.split(' ', 1)[1]
     try:
-        token = Token.objects.get(key=token_key)
-        return token.user, None
-    except Token.DoesNotExist:
-        return None, Response({"detail": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED)
+        user, _ = CachedTokenAuthentication().authenticate_credentials(token_key)
+        return user, None
+    except AuthenticationFailed as exc:
+        return None, Response({"detail": str(exc.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+def content_body_text(digest):
+    """
+    Text of a content body, or None if there is no such body.
+
+    A digest always names the same text, so cached bodies never need invalidating
+    and a body shared by many contents is cached once.
+    """
+    key = CONTENT_BODY_CACHE_KEY.format(digest=digest)
+    text = cache.get(key)
+    if text is None:
+        text = ContentBody.objects.filter(digest=digest).values_list('text', flat=True).first()
+        if text is None:
+            return None
+        cache.set(key, text, getattr(settings, 'CONTENT_BODY_CACHE_TIMEOUT', 24 * 60 * 60))
+    return text
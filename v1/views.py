@@ -1,3 +1,6 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -10,6 +13,8 @@ from teachers.models import TeacherNote
 from users.models import CustomUser
 from school.models import SchoolProfile
 from students.models import StudentClassAssignment
+from v1.utils import DIGEST_PATTERN, content_body_text
+from lms.caching import cache_policy
 
 
 
@@ -114,6 +119,7 @@ def get_subjects_by_class(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_policy('public')
 def get_topics_with_contents_by_subject(request):
     subject_id = request.GET.get('subject_id')
     if not subject_id:
@@ -276,3 +282,32 @@ def get_classes_by_school(request, school_user_id):
 
 
 
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Get Content Body",
+    operation_description=(
+        "Return the text of a content body as text/plain, by the text_digest that content "
+        "lists return. Bodies never change, so the response carries a strong ETag and may be "
+        "cached forever; If-None-Match with that ETag gets a 304."
+    ),
+    responses={200: "Body text", 304: "Not modified", 404: "Body not found"}
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_content_body(request, digest):
+    if not DIGEST_PATTERN.fullmatch(digest):
+        return Response({"error": "Body not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    etag = f'"{digest}"'
+    # Weak comparison: compressed responses carry the ETag as W/"<digest>"
+    if any(tag.removeprefix('W/') == etag for tag in parse_etags(request.headers.get('If-None-Match', ''))):
+        response = HttpResponseNotModified()
+    else:
+        text = content_body_text(digest)
+        if text is None:
+            return Response({"error": "Body not found"}, status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponse(text, content_type='text/plain; charset=utf-8')
+
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    return response